@@ -1,75 +1,124 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 import os
 
+from ticket_queries import DuckDBQueries, FrameQueries
+from ticket_store import LiveTickets
+
 # Set page configuration
 st.set_page_config(page_title="Error Analysis Dashboard", layout="wide")
 
 st.title("Error Analysis Dashboard")
 
-# Default file path
-# Try to find the file in Downloads. If running locally in the folder, it might differ.
-# We will use the absolute path provided in the context.
-FILE_PATH = "c:/Users/mm16010130/Downloads/tickets_20260108_221513.csv"
+# Ticket exports (tickets_20260108_221513.csv, ...) are picked up from this drop
+# directory; exports dropped in while the app runs are added to it.
+DROP_DIR = "c:/Users/mm16010130/Downloads"
+DROP_PATTERN = "tickets_*.csv"
+# Shared with generate_dashboard.py: normalized messages and the ticket store
+# (which each of them locks while ingesting into it)
+CACHE_DIR = "c:/Users/mm16010130/Downloads/ErrorDashboard/.cache"
+TICKET_STORE_DIR = os.path.join(CACHE_DIR, "tickets")
+# DROP_DIR is checked for new exports at most this often (seconds)
+REFRESH_SECONDS = 60
+# "pandas" holds the tickets in memory as one DataFrame. "duckdb" (needs the
+# duckdb package) leaves them in the Parquet ticket store and runs the filters,
+# aggregations and raw data pages there as SQL, for more tickets than fit in RAM.
+QUERY_ENGINE = "pandas"
+# Filter + aggregate results kept per selection (least recently used beyond
+# FILTER_CACHE_ENTRIES, and at most FILTER_CACHE_TTL seconds)
+FILTER_CACHE_ENTRIES = 64
+FILTER_CACHE_TTL = 3600
+# Raw data is shown a page at a time; long text columns are off by default
+RAW_PAGE_SIZES = [50, 100, 500]
+RAW_HIDDEN_COLUMNS = ["error_message", "error_message_nor", "log_link", "analyses", "actions"]
 
 # Load data
+# A shared resource rather than cache_data, which would unpickle a copy of the
+# whole frame on every rerun. Each version of the frame is never modified, only
+# filtered; new exports produce a new version with their new/changed tickets.
+@st.cache_resource
+def live_tickets():
+    return LiveTickets(DROP_DIR, TICKET_STORE_DIR, DROP_PATTERN,
+                       cache_path=os.path.join(CACHE_DIR, "normalization.sqlite"),
+                       materialize=QUERY_ENGINE != "duckdb")
+
+
+@st.cache_resource(max_entries=2)
+def ticket_queries(_frame, version):
+    """The QUERY_ENGINE over one version of the tickets.
+
+    The version follows the store's last_seq, so tickets generate_dashboard.py
+    ingests into the shared store also give DuckDB a new snapshot of it.
+    """
+    if QUERY_ENGINE == "duckdb":
+        return DuckDBQueries(TICKET_STORE_DIR)
+    return FrameQueries(_frame)
+
+
+@st.fragment(run_every=REFRESH_SECONDS)
+def watch_drop_dir(version):
+    """Rerun the app once new exports have changed the tickets."""
+    if live_tickets().refresh(max_age=REFRESH_SECONDS)[0] != version:
+        st.rerun()
+
+
+# The cached functions below take the query engine unhashed (_tickets) and are
+# keyed by the version of the tickets it was made for
+
 @st.cache_data
-def load_data(file_path):
-    if not os.path.exists(file_path):
-        return None
-    
-    # Try reading with different encodings
-    try:
-        df = pd.read_csv(file_path)
-    except UnicodeDecodeError:
-        df = pd.read_csv(file_path, encoding='latin1')
-    
-    # Process dates, handling potential errors
-    df['fail_time'] = pd.to_datetime(df['fail_time'], errors='coerce')
-    return df
+def column_values(_tickets, version, column):
+    return _tickets.values(column)
 
-df = load_data(FILE_PATH)
 
-if df is None:
-    st.error(f"File not found at: {FILE_PATH}. Please make sure the CSV file exists.")
-    st.stop()
+@st.cache_data(max_entries=FILTER_CACHE_ENTRIES, ttl=FILTER_CACHE_TTL)
+def filter_and_aggregate(_tickets, version, models, stages, results, start_date, end_date):
+    """Ticket count and chart data for one selection."""
+    return _tickets.aggregate(models, stages, results, start_date, end_date)
+
+
+@st.cache_data(max_entries=FILTER_CACHE_ENTRIES, ttl=FILTER_CACHE_TTL)
+def raw_data_page(_tickets, version, selection, search, columns, sort_by, ascending, offset, limit):
+    """Matching row count and one page of the raw data."""
+    return _tickets.raw_page(selection, search, columns, sort_by, ascending, offset, limit)
 
-# Helper column for analysis
-# Prefer 'error_message_nor' if available, else 'error_message'
-if 'error_message_nor' in df.columns:
-    df['Analyzed_Error'] = df['error_message_nor'].fillna(df['error_message'])
-else:
-    df['Analyzed_Error'] = df['error_message']
+
+version, frame = live_tickets().refresh(max_age=REFRESH_SECONDS)
+watch_drop_dir(version)
+tickets = ticket_queries(frame, version)
+
+if tickets.empty:
+    st.error(f"No ticket exports ({DROP_PATTERN}) found in: {DROP_DIR}. Waiting for the first one.")
+    st.stop()
 
 # Sidebar Filters
 st.sidebar.header("Filters")
 
 # Model Filter
-if 'model' in df.columns:
-    models = df['model'].unique().tolist()
+if 'model' in tickets.columns:
+    models = column_values(tickets, version, 'model')
     selected_models = st.sidebar.multiselect("Select Model", options=models, default=models)
 else:
     selected_models = []
 
 # Stage Filter
-if 'stage' in df.columns:
-    stages = df['stage'].unique().tolist()
+if 'stage' in tickets.columns:
+    stages = column_values(tickets, version, 'stage')
     selected_stages = st.sidebar.multiselect("Select Stage", options=stages, default=stages)
 else:
     selected_stages = []
 
 # Result Filter
-if 'result' in df.columns:
-    results = df['result'].unique().tolist()
+if 'result' in tickets.columns:
+    results = column_values(tickets, version, 'result')
     selected_results = st.sidebar.multiselect("Select Result", options=results, default=results)
 else:
     selected_results = []
 
 # Time Range Filter
-if 'fail_time' in df.columns and not df['fail_time'].isnull().all():
-    min_date = df['fail_time'].min().date()
-    max_date = df['fail_time'].max().date()
+time_range = tickets.time_range()
+if time_range is not None:
+    min_date = time_range[0].date()
+    max_date = time_range[1].date()
     
     if min_date and max_date:
         start_date, end_date = st.sidebar.date_input(
@@ -82,30 +131,23 @@ else:
     start_date, end_date = None, None
 
 # Apply Filters
-df_filtered = df.copy()
-
-if selected_models:
-    df_filtered = df_filtered[df_filtered['model'].isin(selected_models)]
-if selected_stages:
-    df_filtered = df_filtered[df_filtered['stage'].isin(selected_stages)]
-if selected_results:
-    df_filtered = df_filtered[df_filtered['result'].isin(selected_results)]
-
-if start_date and end_date:
-     df_filtered = df_filtered[
-        (df_filtered['fail_time'].dt.date >= start_date) & 
-        (df_filtered['fail_time'].dt.date <= end_date)
-    ]
+# Selections are keyed by value, so toggling back to an earlier one hits the cache
+selection = (
+    tuple(sorted(selected_models, key=str)),
+    tuple(sorted(selected_stages, key=str)),
+    tuple(sorted(selected_results, key=str)),
+    start_date,
+    end_date,
+)
+view = filter_and_aggregate(tickets, version, *selection)
 
 # Main Dashboard
 col1, col2 = st.columns(2)
 
 with col1:
     st.header("Top Errors")
-    if 'Analyzed_Error' in df_filtered.columns:
-        top_errors = df_filtered['Analyzed_Error'].value_counts().head(10).reset_index()
-        top_errors.columns = ['Error Message', 'Count']
-        fig_errors = px.bar(top_errors, x='Count', y='Error Message', orientation='h', title="Top 10 Frequent Errors")
+    if view['top_errors'] is not None:
+        fig_errors = px.bar(view['top_errors'], x='Count', y='Error Message', orientation='h', title="Top 10 Frequent Errors")
         fig_errors.update_layout(yaxis={'categoryorder':'total ascending'})
         st.plotly_chart(fig_errors, use_container_width=True)
     else:
@@ -113,21 +155,47 @@ with col1:
 
 with col2:
     st.header("Errors Over Time")
-    if start_date and end_date:
-        # Group by day
-        errors_over_time = df_filtered.groupby(df_filtered['fail_time'].dt.date).size().reset_index(name='Count')
-        errors_over_time.columns = ['Date', 'Count']
-        fig_time = px.line(errors_over_time, x='Date', y='Count', title="Daily Error Frequency")
+    if view['errors_over_time'] is not None:
+        fig_time = px.line(view['errors_over_time'], x='Date', y='Count', title="Daily Error Frequency")
         st.plotly_chart(fig_time, use_container_width=True)
     else:
         st.info("No timeline data available (fail_time is missing or invalid).")
 
 st.header("Result Distribution")
-if 'result' in df_filtered.columns:
-    result_counts = df_filtered['result'].value_counts().reset_index()
-    result_counts.columns = ['Result', 'Count']
-    fig_res = px.pie(result_counts, values='Count', names='Result', title="Result Distribution")
+if view['result_counts'] is not None:
+    fig_res = px.pie(view['result_counts'], values='Count', names='Result', title="Result Distribution")
     st.plotly_chart(fig_res, use_container_width=True)
 
 st.header("Raw Data")
-st.dataframe(df_filtered)
+# Only the current page is queried and sent to the browser
+all_columns = tickets.columns
+raw_col1, raw_col2, raw_col3 = st.columns([3, 2, 1])
+with raw_col1:
+    shown_columns = st.multiselect(
+        "Columns", options=all_columns,
+        default=[c for c in all_columns if c not in RAW_HIDDEN_COLUMNS])
+    search = st.text_input("Search shown columns").strip()
+with raw_col2:
+    sort_by = st.selectbox("Sort by", options=[None] + all_columns,
+                           format_func=lambda c: "(file order)" if c is None else c)
+    ascending = st.radio("Order", ["Ascending", "Descending"], horizontal=True) == "Ascending"
+with raw_col3:
+    page_size = st.selectbox("Rows per page", RAW_PAGE_SIZES)
+
+def raw_page(page):
+    return raw_data_page(tickets, version, selection, search, tuple(shown_columns), sort_by, ascending,
+                         (page - 1) * page_size, page_size)
+
+# The page number is read before the widget is drawn, as the page count depends on the query
+page = st.session_state.get("raw_page", 1)
+total, page_rows = raw_page(page)
+page_count = max(1, -(-total // page_size))
+if page > page_count:
+    page = page_count
+    total, page_rows = raw_page(page)
+st.session_state["raw_page"] = page
+with raw_col3:
+    st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, key="raw_page")
+first = (page - 1) * page_size
+st.dataframe(page_rows)
+st.caption(f"Rows {min(first + 1, total)}-{min(first + page_size, total)} of {total}")
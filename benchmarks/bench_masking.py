@@ -0,0 +1,65 @@
+"""Throughput of the volatile-token masking step.
+
+Compares the single-pass MaskTokenizer with applying every mask class as its
+own re.sub pass, over the built-in sample messages or the error messages of
+the ticket exports given on the command line:
+
+    python benchmarks/bench_masking.py [tickets.csv ...]
+"""
+import csv
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from error_rules import ERROR_PREFIX_PATTERN, MASKS, MaskTokenizer  # noqa: E402
+from tests.error_samples import SAMPLE_MESSAGES  # noqa: E402
+
+
+def read_error_messages(path):
+    """Distinct error messages of a ticket export."""
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+    except UnicodeDecodeError:
+        with open(path, newline="", encoding="latin1") as f:
+            rows = list(csv.DictReader(f))
+    column = "error_message_nor" if rows and "error_message_nor" in rows[0] else "error_message"
+    return sorted({row.get(column) or "Unknown" for row in rows})
+
+
+def sequential_masker(masks):
+    compiled = [(re.compile(m.pattern, re.ASCII), m.replacement) for m in masks]
+
+    def mask(text):
+        for pattern, replacement in compiled:
+            text = pattern.sub(replacement, text)
+        return text
+    return mask
+
+
+def throughput(func, messages, repeat=5):
+    """Best-of-``repeat`` messages per second."""
+    best = min(timeit.repeat(lambda: [func(m) for m in messages], number=1, repeat=repeat))
+    return len(messages) / best
+
+
+def main(paths):
+    messages = list(SAMPLE_MESSAGES)
+    for path in paths:
+        messages.extend(read_error_messages(path))
+    prefix = re.compile(ERROR_PREFIX_PATTERN, re.ASCII)
+    messages = [prefix.sub('', m) for m in messages]
+    # Enough volume for stable timings
+    messages = messages * max(1, 20000 // len(messages))
+
+    single = MaskTokenizer(MASKS).mask
+    print(f"{len(messages)} messages, {len(MASKS)} mask classes")
+    for name, func in [("single pass", single), ("one pass per class", sequential_masker(MASKS))]:
+        print(f"  {name:<20} {throughput(func, messages):>12,.0f} msg/s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,138 @@
+"""Time the stages of the dashboard pipeline on synthetic or real ticket exports.
+
+Each stage generate_dashboard.py runs is timed on its own: loading the CSV,
+parsing fail_time, normalizing the error messages (without the cache), the
+other derived columns, serializing the rows and the chart cube, and writing
+the page payloads. Then the page is built end to end by
+generate_dashboard.main() with a cold cache, and the sizes of the CSV, the
+payloads and the page are reported. Exports of each --rows size are made by
+generate_tickets.py (kept in --data-dir, if given) unless CSV files are
+given on the command line:
+
+    python benchmarks/bench_pipeline.py [--rows 10k 100k 1M 10M] [--workers N] [--data-dir DIR] [tickets.csv ...]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import generate_dashboard  # noqa: E402
+from generate_dashboard import CUBE_DIMENSIONS, CountCube, RawTable, drop_unused_hours, write_cube_payload  # noqa: E402
+from generate_tickets import parse_count, write_tickets  # noqa: E402
+from ingestion import categorize, parse_fail_time, prepare_tickets, read_tickets  # noqa: E402
+from normalization import normalization_pool, normalize_errors  # noqa: E402
+
+DEFAULT_ROWS = ["10k", "100k"]
+
+
+def timed(func, repeat=1):
+    """(best-of-``repeat`` seconds, result of the last call)."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def bench_export(path, workers=1, repeat=1):
+    """[(stage, seconds)] and [(output, bytes)] for one export."""
+    times, sizes = [], [("CSV", os.path.getsize(path))]
+
+    seconds, raw = timed(lambda: read_tickets(path), repeat)
+    times.append(("load CSV", seconds))
+    seconds, _ = timed(lambda: parse_fail_time(raw["fail_time"]), repeat)
+    times.append(("parse fail_time", seconds))
+    column = "error_message_nor" if "error_message_nor" in raw.columns else "error_message"
+    with normalization_pool(workers) as pool:
+        seconds, _ = timed(lambda: normalize_errors(raw[column].fillna("Unknown"), pool=pool), repeat)
+        times.append((f"normalize errors (workers={workers})", seconds))
+        seconds, df = timed(lambda: categorize(prepare_tickets(raw.copy(), pool=pool)), repeat)
+    times.append(("prepare (all of the above)", seconds))
+
+    def build_cube():
+        cube = CountCube(CUBE_DIMENSIONS)
+        cube.add(df.assign(fail_hour=df["fail_time"].dt.strftime("%Y-%m-%d %H").fillna("")))
+        drop_unused_hours(cube, df["fail_time"].min(), df["fail_time"].max())
+        return cube
+    seconds, cube = timed(build_cube, repeat)
+    times.append(("count cube", seconds))
+
+    def serialize_rows():
+        raw_table = RawTable(cube.encoders)
+        raw_table.add(df)
+        return raw_table
+    seconds, raw_table = timed(serialize_rows, repeat)
+    times.append(("serialize rows", seconds))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cube_path, raw_path = os.path.join(tmp, "cube.json"), os.path.join(tmp, "rows.json")
+
+        def write_payloads():
+            with open(cube_path, "w", encoding="utf-8") as out:
+                write_cube_payload(out, cube)
+            with open(raw_path, "w", encoding="utf-8") as out:
+                raw_table.write_payload(out)
+        seconds, _ = timed(write_payloads, repeat)
+        raw_table.close()
+        times.append(("write payloads", seconds))
+        sizes += [("cube payload", os.path.getsize(cube_path)), ("raw rows payload", os.path.getsize(raw_path))]
+
+        # The whole script with a cold cache, output silenced
+        output = os.path.join(tmp, "dashboard.html")
+        cache_dir = generate_dashboard.CACHE_DIR
+        generate_dashboard.CACHE_DIR = os.path.join(tmp, "cache")
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                seconds, _ = timed(lambda: generate_dashboard.main(
+                    [path, "-o", output, "--normalize-workers", str(workers)]))
+        finally:
+            generate_dashboard.CACHE_DIR = cache_dir
+        times.append(("generate_dashboard.py end to end", seconds))
+        sizes.append(("page", sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp)
+                                  if f.startswith("dashboard."))))
+    return times, sizes
+
+
+def report(name, times, sizes):
+    print(name)
+    for stage, seconds in times:
+        print(f"  {stage:<36} {seconds:>10.3f} s")
+    for output, size in sizes:
+        print(f"  {output + ' size':<36} {size / 1e6:>10.1f} MB")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Time the dashboard pipeline stages.")
+    parser.add_argument("exports", nargs="*", help="ticket export CSVs (default: synthetic ones of --rows)")
+    parser.add_argument("--rows", nargs="+", default=DEFAULT_ROWS,
+                        help="synthetic export sizes (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=1, help="normalization processes (0: one per CPU)")
+    parser.add_argument("--repeat", type=int, default=1, help="best of this many runs per stage")
+    parser.add_argument("--data-dir", help="keep and reuse the synthetic exports here")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        exports = list(args.exports)
+        if not exports:
+            data_dir = args.data_dir or tmp
+            os.makedirs(data_dir, exist_ok=True)
+            for rows in args.rows:
+                path = os.path.join(data_dir, f"tickets_synthetic_{rows}.csv")
+                if not os.path.exists(path):
+                    print(f"Generating {parse_count(rows):,} tickets...")
+                    write_tickets(path, parse_count(rows))
+                exports.append(path)
+        for path in exports:
+            times, sizes = bench_export(path, args.workers, args.repeat)
+            report(os.path.basename(path), times, sizes)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,206 @@
+"""Synthetic ticket exports for benchmarking.
+
+Writes a CSV with the columns of the ticket export (ingestion.TICKET_DTYPES)
+and value mixes like the real ones: models GEN-8..GEN-11, stages with their
+test items, and error messages built from the templates the rules of
+error_rules.RULES recognize. Volatile tokens (IPs, serial numbers, object
+addresses, ...) vary per ticket, and a NOISE share of one-off messages only
+the masks can reduce. Rows are written in blocks, so a 10M-row file takes no
+more memory than a 10k-row one:
+
+    python benchmarks/generate_tickets.py 1M [-o tickets_1M.csv] [--seed 0] [--noise 0.05]
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from ingestion import TICKET_DTYPES  # noqa: E402
+
+COLUMNS = list(TICKET_DTYPES)
+START = datetime.datetime(2026, 1, 1)
+DAYS = 30
+NOISE = 0.05
+BLOCK = 100_000
+
+# (value, weight) mixes seen in the exports
+STATUSES = [("New", 84), ("PendingDebug", 16)]
+RESULTS = [("Ineffective", 85), ("Effective", 7), ("TBD", 4), ("RETEST", 4)]
+MODELS = [("GEN-9", 85), ("GEN-10", 11), ("GEN-8", 2.5), ("GEN-11", 1.5)]
+STAGES = [("TN", 53), ("N2", 17), ("PT", 13), ("N1", 7), ("TO", 4), ("TP", 2),
+          ("RS", 2), ("QN", 1), ("YC", 0.7), ("CAP", 0.1), ("", 0.2)]
+UPNS = ["M1391239-001$019", "M1391239-001$021", "M1304365-002$007"]
+# test_item is <stage>_<item>
+TEST_ITEMS = [
+    "CP_AUTO_RECONFIG", "NIC_STRESS_NS2", "NIC_STRESS_NS1", "CHK_PSU_CONFIG_CHECK",
+    "TEST_CP_STRESS", "PRELOAD_OS", "FW_BMC_FW_UPDATE_CHECK", "FW_CAP_FW_UPDATE_CHECK",
+    "CLEAR_SEL", "NS2_DATA_SW_TOPOLOGY_CHECK", "NS2_DATA_SW_CONFIG_SET",
+]
+
+# Messages the rules bucket (one per rule, in RULES order), then fallbacks the masks reduce
+RULE_TEMPLATES = [
+    "'Last login: {date} from {ip}start serial session -i {n2} -b {n1}\n\n\nip addr\nWcsCli# start serial session -i {n2} -b {n1}\n' does not appear to be an IPv4 or IPv6 address",
+    "U{n2} create account - fail",
+    "HTTPConnectionPool(host='{ip}', port=5985): Max retries exceeded with url: /wsman (Caused by ConnectTimeoutError(<urllib3.connection.HTTPConnection object at {addr}>, 'Connection to {ip} timed out. (connect timeout=30)'))",
+    "check BMC FW Version, expected equal to C2195.BC.0406, actual: C2195.BC.040{n1} - Fail\nFailed to ping {ip}, DUT is not reachable.",
+    "Command [show manager relay -p {n1}] timeout.",
+    "check DIMM Locator, expected equal to DIMM_A{n1}, actual: DIMM_B{n1} - Fail\ncheck DIMM Quantity, expected equal to 12, actual: 1{n1} - Fail",
+    "Invalid SFCS stage, expected: {stage}, actual: N{n1}",
+    "check sensor Fan_{n1} reading, expected equal to ok, actual: ns - Fail\nL10 BMC SDR check fail",
+    "This BDF {bdf} didn't have device exist in OS",
+    "check System SN, expected equal to {usn}, actual: {usn2} - Fail",
+    "check psu{n1}pwr-511-ac-red, expected equal to OK, actual: NOT - Fail\nTOR switch M1171500-001 (DATA_SW, U{n2}) - Fail",
+    "Failed to process the command: ping -c 4 -i 1 -W 10 {ip}",
+    "check BMC FW Version, expected equal to C2195.BC.0406, actual: C2195.BC.0405 - Fail\nCommand [set system bmc update -i {n2} -f C2195.BC.0406.00.bin] timeout.",
+    "Failed to 'GetUSNGenealogyBasic' with {{'UnitSerialNumber': '{usn}', 'StageCode': '{stage}'}}",
+    "Failed to execute RM cmd: 'set system psu update -i {n1} -f PSU_FW.hex -t 1'",
+    "<pypsrp.powershell.PSDataStreams object at {addr}>\nrc=True, Failed to execute cmd 'cd ~\\.\\inband_tools\\MPF_latest; .\\s ;'",
+    "Get tpm ekcert from sfcs error, error message: ['NoneType' object has no attribute 'get']\nGet dcscmsn[M1304365002B5293{n4}] ekcert failed in SFCS/MES.",
+    "Failed to execute RM cmd: 'set system cmd -i {n2} -c raw 0x34 0x93 0x01 0x04', 'Completion Code: Failure', 'Status Description: Failed to run command ['raw', '0x34', '0x93', '0x01', '0x04'] with error: Unable to send RAW command (channel=0x0 netfn=0x34 lun=0x0 cmd=0x93 rsp=0xd5): Command not supported in present state'",
+]
+FALLBACK_TEMPLATES = [
+    "Failed to ping {ip} at {date}",
+    "fail_id {guid} not found for {usn}",
+    "<urllib3.connection.HTTPConnection object at {addr}> refused",
+    "NVMe {bdf} link down, expected BIOS C2195.BC.0406.00 and CPLD v2.{n1}.{n2}",
+    "start serial session -i {n2} -b {n1} failed",
+    "check PSU Vendor, expected equal to Flex, actual: Flexn - Fail\ncheck PSU Model, expected equal to P2012-100-001, actual: P2012 - Fail",
+]
+# One-off messages: their numbers are not a mask class, so each stays distinct
+NOISE_TEMPLATE = "Unexpected response {n4} from slot {n2} while running step {n1}: code {noise}"
+
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+ANALYSIS = ("{stamp}: [Analyzer: smart_repair] Reason: [Current Diagnosis]: Based on the Error Log, "
+            "the issue appears to be related to {item}. Suggest retest before repair.")
+
+
+def parse_count(text):
+    """Row count from "10000", "10k" or "1M"."""
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if scale > 1 else text) * scale)
+
+
+def _choice(rng, mix, n):
+    values, weights = zip(*mix)
+    p = np.array(weights, dtype=float)
+    return np.array(values, dtype=object)[rng.choice(len(values), n, p=p / p.sum())]
+
+
+def _ips(rng, n):
+    return [f"172.17.{a}.{b}" for a, b in zip(rng.integers(0, 16, n), rng.integers(1, 255, n))]
+
+
+def _usns(rng, n):
+    # Units fail more than once, so serial numbers repeat
+    return [f"P12396024{u:07d}" for u in rng.integers(0, max(n // 3, 1), n)]
+
+
+def ticket_block(rng, first, n, noise=NOISE, days=DAYS):
+    """DataFrame of ``n`` synthetic tickets, numbered from ``first``."""
+    seconds = np.sort(rng.integers(0, days * 86400, n))
+    fail_time = pd.DatetimeIndex(np.datetime64(START, "s") + seconds)
+    # ISO strings are FAIL_TIME_FORMAT with a "T"; far faster than strftime
+    stamps = [t.replace("T", " ") for t in np.datetime_as_string(fail_time.to_numpy(), unit="s")]
+    logged = [t.replace("T", " ") for t in np.datetime_as_string((fail_time - pd.Timedelta(seconds=1)).to_numpy(), unit="s")]
+    stage = _choice(rng, STAGES, n)
+    item = np.array(TEST_ITEMS, dtype=object)[rng.integers(0, len(TEST_ITEMS), n)]
+    test_item = [f"{s or 'TN'}_{i}" for s, i in zip(stage, item)]
+    usn = _usns(rng, n)
+    hexes = rng.bytes(16 * n).hex().upper()
+
+    # Python ints, which format faster than numpy scalars
+    tokens = {
+        "ip": _ips(rng, n),
+        "usn": usn,
+        "usn2": _usns(rng, n),
+        "stage": [s or "TN" for s in stage],
+        "n1": rng.integers(0, 10, n).tolist(),
+        "n2": rng.integers(10, 100, n).tolist(),
+        "n4": rng.integers(1000, 10000, n).tolist(),
+        "addr": [f"0x7f{a:010x}" for a in rng.integers(0, 1 << 40, n)],
+        "bdf": [f"0000:{b:02x}:00.{f}" for b, f in zip(rng.integers(0, 256, n), rng.integers(0, 8, n))],
+        # Fri Jan  9 09:24:01 2026
+        "date": [f"{WEEKDAYS[w]} {MONTHS[m - 1]} {d:2d} {t[11:]} {t[:4]}"
+                 for w, m, d, t in zip(fail_time.dayofweek, fail_time.month, fail_time.day, stamps)],
+        "guid": [f"{g[:8]}-{g[8:12]}-{g[12:16]}-{g[16:20]}-{g[20:]}"
+                 for g in (hexes[i:i + 32] for i in range(0, 32 * n, 32))],
+        "noise": rng.integers(0, 1 << 31, n).tolist(),
+    }
+    templates = RULE_TEMPLATES + FALLBACK_TEMPLATES
+    kind = rng.integers(0, len(templates), n)
+    kind[rng.random(n) < noise] = -1
+    names = list(tokens)
+    messages = []
+    for i, k in enumerate(kind):
+        fields = {name: tokens[name][i] for name in names}
+        messages.append((NOISE_TEMPLATE if k < 0 else templates[k]).format(**fields))
+
+    empty = np.full(n, "", dtype=object)
+    block = pd.DataFrame({c: empty for c in COLUMNS})
+    block["id"] = [f"1V{i:06X}" for i in range(first, first + n)]
+    block["status"] = _choice(rng, STATUSES, n)
+    block["result"] = _choice(rng, RESULTS, n)
+    block["model"] = _choice(rng, MODELS, n)
+    block["upn"] = np.array(UPNS, dtype=object)[rng.integers(0, len(UPNS), n)]
+    block["usn"] = usn
+    block["location"] = [f"RK{r}-1-{s}" for r, s in zip(rng.integers(1, 201, n), rng.integers(1, 49, n))]
+    block["customer"] = "MONICA"
+    block["stage"] = stage
+    block["fail_id"] = tokens["guid"]
+    block["test_item"] = test_item
+    block["symptom_code"] = "[]"
+    # The raw message has the log prefix on every line; error_message_nor does not
+    block["error_message"] = [
+        "\n".join(f"{ts} | ERROR | {line}" for line in m.split("\n")) for ts, m in zip(logged, messages)
+    ]
+    block["error_message_nor"] = messages
+    block["log_link"] = [
+        f"http://10.250.27.32:9862/opt/share/logs/{u}/1/{s}/{u}_{ts[:10].replace('-', '')}.log"
+        for u, s, ts in zip(usn, test_item, stamps)
+    ]
+    block["fail_time"] = stamps
+    block["analyses"] = [ANALYSIS.format(stamp=ts[5:16], item=i.lower().replace("_", " "))
+                         for ts, i in zip(stamps, item)]
+    return block
+
+
+def write_tickets(path, rows, seed=0, noise=NOISE, days=DAYS, block_size=BLOCK):
+    """Write a synthetic export of ``rows`` tickets to ``path``."""
+    rng = np.random.default_rng(seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        for first in range(0, rows, block_size):
+            block = ticket_block(rng, first, min(block_size, rows - first), noise, days)
+            block.to_csv(f, header=first == 0, index=False, lineterminator="\n")
+        if rows == 0:
+            f.write(",".join(COLUMNS) + "\n")
+    return path
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Write a synthetic ticket export.")
+    parser.add_argument("rows", help="number of tickets, e.g. 10k, 100k, 1M, 10M")
+    parser.add_argument("-o", "--output", help="CSV to write (default: tickets_synthetic_<rows>.csv)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--noise", type=float, default=NOISE, help="share of one-off error messages")
+    parser.add_argument("--days", type=int, default=DAYS, help="days of fail_time from 2026-01-01")
+    args = parser.parse_args(argv)
+
+    rows = parse_count(args.rows)
+    path = args.output or f"tickets_synthetic_{args.rows}.csv"
+    start = time.perf_counter()
+    write_tickets(path, rows, args.seed, args.noise, args.days)
+    print(f"{rows:,} tickets written to {path} "
+          f"({os.path.getsize(path) / 1e6:,.1f} MB, {time.perf_counter() - start:.1f} s)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
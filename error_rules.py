@@ -0,0 +1,407 @@
+import hashlib
+import json
+import re
+from collections import namedtuple
+
+# Standardization rules for error messages.
+#
+# Each rule is one row of a declarative table:
+#   kind        - "prefix" (startswith), "suffix" (endswith, on the message
+#                 stripped of WHITESPACE) or "contains" (substring anywhere)
+#   pattern     - the literal the rule is keyed on
+#   replacement - the bucket every matching message is collapsed into
+#   priority    - lower wins when several rules match the same message
+#   requires    - extra literals that must also appear somewhere in the message
+#
+# Messages that match no rule fall through to MASKS.
+#
+# This table is the single source of truth: generate_dashboard.py embeds it in
+# the HTML (rules_payload) and the browser compiles it with JS_NORMALIZER.
+# Patterns therefore have to stay valid in both Python and JavaScript regex
+# syntax, and match the same text in both: they are compiled with re.ASCII
+# (\d is [0-9] there, as in JavaScript), and whitespace is spelled out as _S
+# because JavaScript's \s also matches Unicode spaces.
+Rule = namedtuple("Rule", ["kind", "pattern", "replacement", "priority", "requires"])
+Rule.__new__.__defaults__ = ((),)
+
+RULES = [
+    # Groups all variations of this specific error into one single bucket.
+    Rule("contains", "does not appear to be an IPv4 or IPv6 address",
+         "'Last login: DATE from XXX.XXX.XXX.XXXstart serial session -i XX -b X\\n\\n\\nip addr\\nWcsCli# start serial session -i XX -b X\\n' does not appear to be an IPv4 or IPv6 address",
+         10),
+    Rule("suffix", "create account - fail",
+         "UXX create account - fail",
+         20),
+    Rule("suffix", "timed out. (connect timeout=30)'))",
+         "HTTPConnectionPool(host='XXX.XXX.XXX.{id}', port=5985): Max retries exceeded with url: /wsman (Caused by ConnectTimeoutError(<urllib3.connection.HTTPConnection object at XxXXXXXXXXXXXXX>, 'Connection to XXX.XXX.XXX.XXX timed out. (connect timeout=30)'))",
+         30),
+    Rule("prefix", "check BMC FW Version",
+         "check BMC FW Version, expected equal to C2195.BC.0406, actual: C2195.BC.0405 - Fail\nFailed to ping 172.XXX.XXX.XXX, DUT is not reachable.",
+         40, ("Failed to ping",)),
+    Rule("prefix", "Command [show manager relay -p",
+         "Command [show manager relay -p X] timeout.",
+         50),
+    Rule("prefix", "check DIMM Locator, expected equal to DIMM_",
+         "check DIMM Locator, expected equal to DIMM_XN, actual: DIMM_XN - Fail\ncheck DIMM Quantity, expected equal to 12, actual: {not equality} - Fail",
+         60),
+    Rule("prefix", "Invalid SFCS stage, expected:",
+         "Invalid SFCS stage, expected: Zz, actual: Xx",
+         70),
+    Rule("prefix", "check sensor Fan_",
+         "check sensor Fan_Nx reading, expected equal to ok, actual: ns - Fail\nL10 BMC SDR check fail",
+         80),
+    Rule("suffix", "didn't have device exist in OS",
+         "This BDF XXXX:XX:XX.X didn't have device exist in OS",
+         90),
+    Rule("prefix", "check System SN, expected equal to",
+         "check System SN, expected equal to PXXXXXXXXXXXXXXX, actual: PYYYYYYYYYYYYYYY - Fail",
+         100),
+    Rule("contains", "expected equal to OK, actual: NOT - Fail",
+         "check psuXpwr-511-ac-red, expected equal to OK, actual: NOT - Fail\nTOR switch M1171500-001 (DATA_SW, UXX) - Fail",
+         110, ("TOR switch",)),
+    Rule("prefix", "Failed to process the command: ping -c",
+         "Failed to process the command: ping -c X -i X -W XX 172.XX.XX.XX",
+         120),
+    # Substring check for the first part to avoid issues with exact whitespace matching
+    Rule("contains", "check BMC FW Version",
+         "check BMC FW Version, expected equal to C2195.BC.0406, actual: C2195.BC.0405 - Fail\nCommand [set system bmc update -i X -f C2195.BC.0406.00.bin] timeout.",
+         130, ("Command [set system bmc update -i",)),
+    Rule("prefix", "Failed to 'GetUSNGenealogyBasic' with {'UnitSerialNumber': 'P",
+         "Failed to 'GetUSNGenealogyBasic' with {'UnitSerialNumber': 'P{id}', 'StageCode': 'XX'}",
+         140),
+    Rule("prefix", "Failed to execute RM cmd: 'set system psu update -i",
+         "Failed to execute RM cmd: 'set system psu update -i X -f File.hex -t X'",
+         150),
+    Rule("prefix", "<pypsrp.powershell.PSDataStreams object at",
+         "<pypsrp.powershell.PSDataStreams object at 0x7XXXXXXXXXXXX>\nrc=True, Failed to execute cmd 'cd ~\\.\\inband_tools\\MPF_latest; .\\s ;'",
+         160),
+    Rule("prefix", "Get tpm ekcert from sfcs error",
+         "Get tpm ekcert from sfcs error, error message: ['NoneType' object has no attribute 'get']\nGet dcscmsn[M1304365002B5293XXXXXXX] ekcert failed in SFCS/MES.",
+         170),
+    Rule("contains", "Unable to send RAW command (channel=0x0 netfn=0x34 lun=0x0 cmd=0x93 rsp=0xd5): Command not supported in present state",
+         "Failed to execute RM cmd: 'set system cmd -i XX -c raw 0x34 0x93 0x01 0x04', 'Completion Code: Failure', 'Status Description: Failed to run command ['raw', '0x{id}', '0x{id}', '0x{id}', '0x{id}'] with error: Unable to send RAW command (channel=0x0 netfn=0x34 lun=0x0 cmd=0x93 rsp=0xd5): Command not supported in present state'",
+         180),
+]
+
+# Characters suffix rules strip from both ends of a message. Spelled out
+# because str.strip() and JavaScript's trim() disagree on what is whitespace.
+WHITESPACE = " \t\n\r\f\v"
+
+# Log prefix stripped from every line before standardizing:
+# "2026-01-08 22:15:06 | ERROR | "
+ERROR_PREFIX_PATTERN = r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2} \| ERROR \| '
+
+# Generic fallback: volatile token classes masked in messages that match no rule.
+#
+# All classes are combined into one alternation and masked in a single
+# left-to-right scan (MaskTokenizer). Tokens only start at an ASCII word
+# boundary, and where two classes could match at the same position the one
+# listed first wins. To add a class, append a Mask; its pattern must not
+# contain capturing groups.
+Mask = namedtuple("Mask", ["name", "pattern", "replacement"])
+
+# ASCII word boundary, spelled out so Python and JavaScript agree
+_E = r'(?![0-9A-Za-z])'
+# ASCII whitespace: the characters of WHITESPACE, as a regex class
+_S = r'[ \t\n\r\f\v]'
+
+MASKS = [
+    # Date: Fri Jan  9 09:24:01 2026
+    Mask("date", r'[A-Za-z]{3}' + _S + r'+[A-Za-z]{3}' + _S + r'+\d+' + _S + r'+\d{2}:\d{2}:\d{2}' + _S + r'+\d{4}', 'DATE'),
+    # GUID: BAAB6ABD-92A9-4E71-830A-081A3AF879B5 (fail_id)
+    Mask("guid", r'[0-9A-Fa-f]{8}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{4}-[0-9A-Fa-f]{12}' + _E, 'GUID'),
+    # PCI BDF: 0000:3b:00.0
+    Mask("bdf", r'(?<![0-9A-Za-z:])[0-9A-Fa-f]{4}:[0-9A-Fa-f]{2}:[0-9A-Fa-f]{2}\.[0-7]' + _E, 'XXXX:XX:XX.X'),
+    # Unit serial number: P123960240113012
+    Mask("usn", r'P\d{15}' + _E, 'PXXXXXXXXXXXXXXX'),
+    # Object address: 0x7070d4703490
+    Mask("address", r'0x[0-9A-Fa-f]{9,}' + _E, '0xXXXXXXXX'),
+    # IP: 172.17.6.32
+    Mask("ip", r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}', 'XXX.XXX.XXX.XXX'),
+    # Firmware version: C2195.BC.0406, C2195.BC.0406.00, v2.14.1
+    Mask("fw_version", r'(?<!\.)(?:[A-Z]\d{4}\.[A-Z]{2}\.\d{4}(?:\.\d+)*|v\d+(?:\.\d+)+)' + _E, 'FW_VERSION'),
+    # Session ID: -i 35 -> -i XX (not the start of an IP address)
+    Mask("session_i", r'-i' + _S + r'+\d+(?!\d|\.\d)', '-i XX'),
+    # Session ID: -b 1 -> -b X
+    Mask("session_b", r'-b' + _S + r'+\d+(?!\d|\.\d)', '-b X'),
+]
+
+
+class MaskTokenizer:
+    """Masks every volatile token class of ``masks`` in one linear scan."""
+
+    def __init__(self, masks):
+        self.masks = list(masks)
+        for mask in self.masks:
+            if re.compile(mask.pattern, re.ASCII).groups:
+                raise ValueError(f"Mask {mask.name!r} must not use capturing groups")
+        if self.masks:
+            # Checking the word boundary once up front lets the scan skip word
+            # interiors instead of trying every class at every position.
+            self.pattern = (r'(?<![0-9A-Za-z])(?:'
+                            + "|".join(f"({m.pattern})" for m in self.masks) + ")")
+            self._re = re.compile(self.pattern, re.ASCII)
+        else:
+            self.pattern = None
+            self._re = None
+        # Group n holds a match of masks[n - 1]
+        self._replacements = [None] + [m.replacement for m in self.masks]
+
+    def _replace(self, match):
+        return self._replacements[match.lastindex]
+
+    def mask(self, text):
+        if self._re is None:
+            return text
+        return self._re.sub(self._replace, text)
+
+
+class RuleEngine:
+    """Compiles a rule table into a single dispatcher.
+
+    Prefix and suffix rules are bucketed by their shortest key length, so
+    finding them is one dict lookup per message. All "contains" literals
+    (including the ``requires`` ones) are found in one regex scan.
+    """
+
+    def __init__(self, rules, masks):
+        self.rules = sorted(rules, key=lambda r: r.priority)
+        self.tokenizer = MaskTokenizer(masks)
+
+        prefix_rules = [r for r in self.rules if r.kind == "prefix"]
+        suffix_rules = [r for r in self.rules if r.kind == "suffix"]
+        contains_rules = [r for r in self.rules if r.kind == "contains"]
+        unknown = {r.kind for r in self.rules} - {"prefix", "suffix", "contains"}
+        if unknown:
+            raise ValueError(f"Unknown rule kind(s): {sorted(unknown)}")
+
+        self._prefix_len = min((len(r.pattern) for r in prefix_rules), default=0)
+        self._prefix_index = {}
+        for r in prefix_rules:
+            self._prefix_index.setdefault(r.pattern[:self._prefix_len], []).append(r)
+
+        self._suffix_len = min((len(r.pattern) for r in suffix_rules), default=0)
+        self._suffix_index = {}
+        for r in suffix_rules:
+            self._suffix_index.setdefault(r.pattern[-self._suffix_len:], []).append(r)
+
+        self._contains_rules = contains_rules
+        literals = {r.pattern for r in contains_rules}
+        for r in self.rules:
+            literals.update(r.requires)
+        # Longest first: at any position the regex reports the longest literal
+        # starting there; every other literal matching at that position is a
+        # prefix of it and is recovered through _implied. Restarting the search
+        # one character after each hit keeps overlapping literals visible.
+        literals = sorted(literals, key=len, reverse=True)
+        self._implied = {
+            lit: [other for other in literals if other != lit and lit.startswith(other)]
+            for lit in literals
+        }
+        if literals:
+            self._literal_re = re.compile("|".join(re.escape(l) for l in literals), re.ASCII)
+        else:
+            self._literal_re = None
+
+    def _find_literals(self, err):
+        found = set()
+        if self._literal_re is None:
+            return found
+        search = self._literal_re.search
+        m = search(err)
+        while m is not None:
+            lit = m.group()
+            if lit not in found:
+                found.add(lit)
+                found.update(self._implied[lit])
+            m = search(err, m.start() + 1)
+        return found
+
+    def classify(self, err):
+        """Return the highest-priority rule matching ``err``, or None."""
+        found = None
+        best = None
+        # Index buckets are already in priority order, so the first hit wins.
+        if self._prefix_len:
+            for r in self._prefix_index.get(err[:self._prefix_len], ()):
+                if err.startswith(r.pattern):
+                    if r.requires:
+                        if found is None:
+                            found = self._find_literals(err)
+                        if not all(lit in found for lit in r.requires):
+                            continue
+                    best = r
+                    break
+        if self._suffix_len:
+            stripped = err.strip(WHITESPACE)
+            for r in self._suffix_index.get(stripped[-self._suffix_len:], ()):
+                if best is not None and r.priority >= best.priority:
+                    break
+                if stripped.endswith(r.pattern):
+                    if r.requires:
+                        if found is None:
+                            found = self._find_literals(err)
+                        if not all(lit in found for lit in r.requires):
+                            continue
+                    best = r
+                    break
+        for r in self._contains_rules:
+            if best is not None and r.priority >= best.priority:
+                break
+            if found is None:
+                found = self._find_literals(err)
+            if r.pattern in found and all(lit in found for lit in r.requires):
+                best = r
+                break
+        return best
+
+    def standardize(self, err):
+        rule = self.classify(err)
+        if rule is not None:
+            return rule.replacement
+        return self.tokenizer.mask(err)
+
+
+_ENGINE = RuleEngine(RULES, MASKS)
+
+
+_ERROR_PREFIX_RE = re.compile(ERROR_PREFIX_PATTERN, re.ASCII)
+
+
+def standardize_error(err):
+    """Collapse a cleaned error message into its standardized bucket."""
+    return _ENGINE.standardize(err)
+
+
+def clean_error(raw):
+    """Strip the log prefixes from a raw message, then standardize it."""
+    return _ENGINE.standardize(_ERROR_PREFIX_RE.sub('', raw))
+
+
+def rules_payload():
+    """Compact, JSON-serializable form of the rule table for the browser.
+
+    Rules are emitted in priority order as [kind, pattern, replacement, requires].
+    """
+    return {
+        "prefix": ERROR_PREFIX_PATTERN,
+        "whitespace": WHITESPACE,
+        "rules": [[r.kind, r.pattern, r.replacement, list(r.requires)] for r in _ENGINE.rules],
+        "masks": {
+            "pattern": _ENGINE.tokenizer.pattern,
+            "replacements": [m.replacement for m in _ENGINE.tokenizer.masks],
+        },
+    }
+
+
+# Changes whenever the rule table does; persisted normalization results are
+# keyed by it so they are never reused across rule edits.
+RULESET_VERSION = hashlib.sha1(
+    json.dumps(rules_payload(), sort_keys=True).encode("utf-8")
+).hexdigest()[:12]
+
+
+# Browser-side compiler for rules_payload(). Mirrors RuleEngine: prefix/suffix
+# rules are looked up through an index keyed by their shortest length, and all
+# "contains"/"requires" literals are found with one combined RegExp.
+JS_NORMALIZER = r"""
+function compileErrorRules(spec) {
+    const escapeRe = s => s.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+    const prefixRe = new RegExp(spec.prefix, 'g');
+    // trim() would also strip Unicode spaces, which str.strip(WHITESPACE) keeps
+    const whitespace = new Set(spec.whitespace);
+    const strip = s => {
+        let start = 0, end = s.length;
+        while (start < end && whitespace.has(s[start])) start++;
+        while (end > start && whitespace.has(s[end - 1])) end--;
+        return s.slice(start, end);
+    };
+    // One alternation over all mask classes; group n is a match of mask n - 1
+    const maskRe = spec.masks.pattern ? new RegExp(spec.masks.pattern, 'g') : null;
+    const maskReplacements = spec.masks.replacements;
+    const maskToken = (...args) => {
+        for (let i = 1; i <= maskReplacements.length; i++) {
+            if (args[i] !== undefined) return maskReplacements[i - 1];
+        }
+        return args[0];
+    };
+    const rules = spec.rules.map(([kind, pattern, replacement, requires], priority) =>
+        ({kind, pattern, replacement, requires, priority}));
+
+    const buildIndex = (kind, keyOf) => {
+        const list = rules.filter(r => r.kind === kind);
+        const len = list.length ? Math.min(...list.map(r => r.pattern.length)) : 0;
+        const index = new Map();
+        list.forEach(r => {
+            const key = keyOf(r.pattern, len);
+            if (!index.has(key)) index.set(key, []);
+            index.get(key).push(r);
+        });
+        return {len, index};
+    };
+    const prefixes = buildIndex('prefix', (s, n) => s.slice(0, n));
+    const suffixes = buildIndex('suffix', (s, n) => s.slice(s.length - n));
+    const containsRules = rules.filter(r => r.kind === 'contains');
+
+    const litSet = new Set(containsRules.map(r => r.pattern));
+    rules.forEach(r => r.requires.forEach(l => litSet.add(l)));
+    const literals = Array.from(litSet).sort((a, b) => b.length - a.length);
+    const implied = new Map(literals.map(l => [l, literals.filter(o => o !== l && l.startsWith(o))]));
+    const literalRe = literals.length ? new RegExp(literals.map(escapeRe).join('|'), 'g') : null;
+
+    function findLiterals(err) {
+        const found = new Set();
+        if (!literalRe) return found;
+        literalRe.lastIndex = 0;
+        let m;
+        while ((m = literalRe.exec(err)) !== null) {
+            if (!found.has(m[0])) {
+                found.add(m[0]);
+                implied.get(m[0]).forEach(l => found.add(l));
+            }
+            literalRe.lastIndex = m.index + 1;
+        }
+        return found;
+    }
+
+    function classify(err) {
+        let found = null;
+        let best = null;
+        const requiresMet = r => {
+            if (!r.requires.length) return true;
+            if (found === null) found = findLiterals(err);
+            return r.requires.every(l => found.has(l));
+        };
+        if (prefixes.len) {
+            for (const r of prefixes.index.get(err.slice(0, prefixes.len)) || []) {
+                if (err.startsWith(r.pattern) && requiresMet(r)) { best = r; break; }
+            }
+        }
+        if (suffixes.len) {
+            const stripped = strip(err);
+            for (const r of suffixes.index.get(stripped.slice(Math.max(0, stripped.length - suffixes.len))) || []) {
+                if (best && r.priority >= best.priority) break;
+                if (stripped.endsWith(r.pattern) && requiresMet(r)) { best = r; break; }
+            }
+        }
+        for (const r of containsRules) {
+            if (best && r.priority >= best.priority) break;
+            if (found === null) found = findLiterals(err);
+            if (found.has(r.pattern) && requiresMet(r)) { best = r; break; }
+        }
+        return best;
+    }
+
+    function standardize(err) {
+        const rule = classify(err);
+        if (rule) return rule.replacement;
+        return maskRe ? err.replace(maskRe, maskToken) : err;
+    }
+
+    return {
+        classify: classify,
+        standardize: standardize,
+        clean: raw => standardize(raw.replace(prefixRe, ''))
+    };
+}
+"""
@@ -1,168 +1,376 @@
-import pandas as pd
+import argparse
+import base64
+import glob
+import gzip
+import io
 import json
 import os
-import re
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+from error_rules import JS_NORMALIZER, rules_payload
+from ingestion import DEFAULT_CHUNKSIZE, iter_ticket_chunks, load_export, load_prepared_tickets, prepare_tickets
+from normalization import NormalizationCache, normalization_pool
+from ticket_store import COMPACT_THRESHOLD, TicketStore, export_snapshot, ticket_keys
 
-# Define file paths
+# Define file paths (defaults for the command line, see main())
 FILE_PATH = "c:/Users/mm16010130/Downloads/tickets_20260108_221513.csv"
 OUTPUT_FILE = "c:/Users/mm16010130/Downloads/ErrorDashboard/dashboard.html"
-
-# Load Data
-print("Loading data...")
-try:
-    
-    df = pd.read_csv(FILE_PATH)
-except UnicodeDecodeError:
-    df = pd.read_csv(FILE_PATH, encoding='latin1')
-except Exception as e:
-    print(f"Error loading CSV: {e}")
-    exit(1)
-
-# Preprocessing
-print("Processing data...")
-# Dates
-df['fail_time'] = pd.to_datetime(df['fail_time'], errors='coerce')
-
-# Error Column Logic
-# User requested strict usage of 'error_message_nor'
-if 'error_message_nor' in df.columns:
-    # Use error_message_nor, fill with "Unknown" or empty if missing, 
-    # but the user emphasis implies we should trust this column.
-    # We will still fallback for now to avoid empty charts if data is poor, 
-    # but logically prioritize it.
-    df['Analyzed_Error'] = df['error_message_nor'].fillna("Unknown")
-else:
-    df['Analyzed_Error'] = df['error_message'] 
-
-
-# Data Cleaning
-# 1. Remove initial prefix
-df['Analyzed_Error'] = df['Analyzed_Error'].astype(str).str.replace(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2} \| ERROR \| ', '', regex=True)
-
-# 2. Standardize specific patterns (Dates, IPs, Session IDs)
-def standardize_error(err):
-    # Specialized replacement for "does not appear to be an IPv4 or IPv6 address"
-    # This groups all variations of this specific error into one single bucket.
-    if "does not appear to be an IPv4 or IPv6 address" in err:
-         return "'Last login: DATE from XXX.XXX.XXX.XXXstart serial session -i XX -b X\\n\\n\\nip addr\\nWcsCli# start serial session -i XX -b X\\n' does not appear to be an IPv4 or IPv6 address"
-
-    # Specialized replacement for "create account - fail"
-    if err.strip().endswith("create account - fail"):
-        return "UXX create account - fail"
-        
-    # Specialized replacement for "timed out. (connect timeout=30)'))"
-    if err.strip().endswith("timed out. (connect timeout=30)'))"):
-        return "HTTPConnectionPool(host='XXX.XXX.XXX.{id}', port=5985): Max retries exceeded with url: /wsman (Caused by ConnectTimeoutError(<urllib3.connection.HTTPConnection object at XxXXXXXXXXXXXXX>, 'Connection to XXX.XXX.XXX.XXX timed out. (connect timeout=30)'))"
-
-    # Specialized replacement for "check BMC FW Version"
-    if err.startswith("check BMC FW Version") and "Failed to ping" in err:
-        return "check BMC FW Version, expected equal to C2195.BC.0406, actual: C2195.BC.0405 - Fail\nFailed to ping 172.XXX.XXX.XXX, DUT is not reachable."
-
-    # Specialized replacement for "Command [show manager relay -p"
-    if err.startswith("Command [show manager relay -p"):
-        return "Command [show manager relay -p X] timeout."
-
-    # Specialized replacement for "check DIMM Locator"
-    if err.startswith("check DIMM Locator, expected equal to DIMM_"):
-        return "check DIMM Locator, expected equal to DIMM_XN, actual: DIMM_XN - Fail\ncheck DIMM Quantity, expected equal to 12, actual: {not equality} - Fail"
-
-    # Specialized replacement for "Invalid SFCS stage"
-    if err.startswith("Invalid SFCS stage, expected:"):
-        return "Invalid SFCS stage, expected: Zz, actual: Xx"
-
-    # Specialized replacement for "check sensor Fan_"
-    if err.startswith("check sensor Fan_"):
-        return "check sensor Fan_Nx reading, expected equal to ok, actual: ns - Fail\nL10 BMC SDR check fail"
-
-    # Specialized replacement for "didn't have device exist in OS"
-    if err.strip().endswith("didn't have device exist in OS"):
-        return "This BDF XXXX:XX:XX.X didn't have device exist in OS"
-
-    # Specialized replacement for "check System SN"
-    if err.startswith("check System SN, expected equal to"):
-        return "check System SN, expected equal to PXXXXXXXXXXXXXXX, actual: PYYYYYYYYYYYYYYY - Fail"
-
-    # Specialized replacement for "TOR switch" and "expected equal to OK, actual: NOT - Fail"
-    if "expected equal to OK, actual: NOT - Fail" in err and "TOR switch" in err:
-        return "check psuXpwr-511-ac-red, expected equal to OK, actual: NOT - Fail\nTOR switch M1171500-001 (DATA_SW, UXX) - Fail"
-
-    # Specialized replacement for "Failed to process the command: ping -c"
-    if err.startswith("Failed to process the command: ping -c"):
-        return "Failed to process the command: ping -c X -i X -W XX 172.XX.XX.XX"
-
-    # Specialized replacement for "check BMC FW Version" and "Command [set system bmc update -i"
-    # We use a substring check for the first part to avoid issues with exact whitespace matching
-    if "check BMC FW Version" in err and "Command [set system bmc update -i" in err:
-        return "check BMC FW Version, expected equal to C2195.BC.0406, actual: C2195.BC.0405 - Fail\nCommand [set system bmc update -i X -f C2195.BC.0406.00.bin] timeout."
-
-    # Specialized replacement for "Failed to 'GetUSNGenealogyBasic'"
-    if err.startswith("Failed to 'GetUSNGenealogyBasic' with {'UnitSerialNumber': 'P"):
-        return "Failed to 'GetUSNGenealogyBasic' with {'UnitSerialNumber': 'P{id}', 'StageCode': 'XX'}"
-
-    # Specialized replacement for "Failed to execute RM cmd: 'set system psu update -i"
-    if err.startswith("Failed to execute RM cmd: 'set system psu update -i"):
-        return "Failed to execute RM cmd: 'set system psu update -i X -f File.hex -t X'"
-
-    # Specialized replacement for "<pypsrp.powershell.PSDataStreams object at"
-    if err.startswith("<pypsrp.powershell.PSDataStreams object at"):
-        return "<pypsrp.powershell.PSDataStreams object at 0x7XXXXXXXXXXXX>\nrc=True, Failed to execute cmd 'cd ~\\.\\inband_tools\\MPF_latest; .\\s ;'"
-
-    # Specialized replacement for "Get tpm ekcert from sfcs error"
-    if err.startswith("Get tpm ekcert from sfcs error"):
-        return "Get tpm ekcert from sfcs error, error message: ['NoneType' object has no attribute 'get']\nGet dcscmsn[M1304365002B5293XXXXXXX] ekcert failed in SFCS/MES."
-
-    # Specialized replacement for "Unable to send RAW command"
-    if "Unable to send RAW command (channel=0x0 netfn=0x34 lun=0x0 cmd=0x93 rsp=0xd5): Command not supported in present state" in err:
-        return "Failed to execute RM cmd: 'set system cmd -i XX -c raw 0x34 0x93 0x01 0x04', 'Completion Code: Failure', 'Status Description: Failed to run command ['raw', '0x{id}', '0x{id}', '0x{id}', '0x{id}'] with error: Unable to send RAW command (channel=0x0 netfn=0x34 lun=0x0 cmd=0x93 rsp=0xd5): Command not supported in present state'"
-
-    # Date: Fri Jan  9 09:24:01 2026
-    err = re.sub(r'[A-Za-z]{3}\s+[A-Za-z]{3}\s+\d+\s+\d{2}:\d{2}:\d{2}\s+\d{4}', 'DATE', err)
-    # IP: 172.17.6.32
-    err = re.sub(r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}', 'XXX.XXX.XXX.XXX', err)
-    # Session ID: -i 35 -> -i XX
-    err = re.sub(r'-i\s+\d+', '-i XX', err)
-    # Session ID: -b 1 -> -b X
-    err = re.sub(r'-b\s+\d+', '-b X', err)
-    return err
-
-df['Analyzed_Error'] = df['Analyzed_Error'].apply(standardize_error)
-
-# Prepare data for Client-Side JSON
-# We need ALL columns for the "Full Download" requirement
-# Convert timestamps to string YYYY-MM-DD for easier JS handling
-df['date_str'] = df['fail_time'].apply(lambda x: x.strftime('%Y-%m-%d') if pd.notnull(x) else "")
-
-# Calculate Date Range before conversion
-valid_dates = df['fail_time'].dropna()
-if not valid_dates.empty:
-    min_date = valid_dates.min().strftime('%Y-%m-%d')
-    max_date = valid_dates.max().strftime('%Y-%m-%d')
-else:
-    min_date = ""
-    max_date = ""
-
-# Fill NaNs for safeguard in JS
-df = df.fillna("")
-
-# Convert all datetime columns to string
-for col in df.select_dtypes(include=['datetime64', 'datetimetz']).columns:
-    df[col] = df[col].astype(str)
-
-# Convert entire dataframe to dict
-data_records = df.to_dict(orient='records')
-json_data = json.dumps(data_records)
-
-# Unique values for dropdowns
-unique_models = sorted(df['model'].unique().astype(str).tolist()) if 'model' in df.columns else []
-unique_results = sorted(df['result'].unique().astype(str).tolist()) if 'result' in df.columns else []
-
-# --- HTML Generation ---
-print("Generating HTML...")
-
-js_models = json.dumps(unique_models)
-js_results = json.dumps(unique_results)
-
-html_content = f"""
+# Several exports are prepared in parallel by this many processes (None: one per CPU)
+JOBS = None
+# Processes normalizing the distinct error messages of a single export (None:
+# one per CPU); exports with few distinct messages are normalized in-process
+NORMALIZE_WORKERS = 1
+# Normalized messages are remembered here across runs (keyed by message + rule-set version)
+CACHE_DIR = "c:/Users/mm16010130/Downloads/ErrorDashboard/.cache"
+
+# Ingestion
+# STREAMING reads the export CHUNKSIZE rows at a time; each chunk is normalized,
+# aggregated and serialized as it is read, so memory stays flat on multi-GB dumps.
+# Several exports are then merged in two serial passes (see streamed_exports).
+STREAMING = False
+CHUNKSIZE = DEFAULT_CHUNKSIZE
+# "c" (pandas) or "pyarrow" (needs the pyarrow package)
+CSV_ENGINE = "c"
+# USE_TICKET_STORE keeps prepared tickets in an append-only Parquet store keyed by
+# fail_id: each run only processes tickets that are new or changed since the last
+# export, and the dashboard is built from the store. Superseded versions are
+# compacted away once they pass ticket_store.COMPACT_THRESHOLD (or with --compact).
+USE_TICKET_STORE = False
+TICKET_STORE_DIR = os.path.join(CACHE_DIR, "tickets")
+
+# Columns the charts and filters work with. The page gets a count cube over
+# them: one cell per distinct combination, stored column-wise as integer codes
+# into per-column lookup tables, which the page loads into typed arrays. The
+# full rows are only parsed for "Download Raw Data".
+DIMENSIONS = ["date_str", "model", "result", "test_item", "Analyzed_Error"]
+
+# Finest resolution of the Trend Failure timeline. "fail_hour" (YYYY-MM-DD HH of
+# fail_time) adds an hour column to the cube; the page rolls it up into days,
+# weeks and months and picks the resolution from the selected date range.
+# "date_str" keeps the cube daily (fewer cells) and the timeline day and up.
+TIME_DIMENSION = "fail_hour"
+CUBE_DIMENSIONS = DIMENSIONS + [d for d in [TIME_DIMENSION] if d not in DIMENSIONS]
+# The hour column is only kept when the tickets span at most this many days,
+# the longest date range the page draws by the hour. Over longer spans it
+# would multiply the cells for a resolution the timeline does not pick, so
+# the cube is rolled up to days (uploads too).
+HOURLY_MAX_DAYS = 3
+
+# Loaded by the page and, with importScripts, by its upload worker. Before 5.3.1
+# PapaParse took any worker started from a blob: URL for one of its own and
+# posted its raw results instead of calling chunk/complete.
+PAPAPARSE_URL = "https://cdnjs.cloudflare.com/ajax/libs/PapaParse/5.4.1/papaparse.min.js"
+
+# Level of detail, so chart size does not grow with the number of distinct values:
+# the test item bar/pie and the error pie show the CHART_TOP_N largest entries
+# plus one "Other" entry. Each sunburst node shows its SUNBURST_TOP_N largest
+# children plus "Other", and only SUNBURST_DEPTH levels below the model / test
+# item / error currently clicked; clicking a node drills down into it.
+CHART_TOP_N = 30
+SUNBURST_TOP_N = 10
+SUNBURST_DEPTH = 2
+
+# How the data is stored (see readPayload in the page):
+#   None        plain JSON inside the page
+#   "embedded"  gzipped and base64-encoded inside the page, several times smaller
+#   "sidecar"   gzipped next to the page as <name>.charts.json.gz and
+#               <name>.rows.json.gz; the page fetches them, so it has to be
+#               served over http(s) - browsers block fetch() from file:// pages
+PAYLOAD_COMPRESSION = None
+
+# Stand in for the data while the HTML template is rendered
+CUBE_DATA_PLACEHOLDER = "/*__CUBE_DATA__*/"
+RAW_DATA_PLACEHOLDER = "/*__RAW_DATA__*/"
+
+
+def distinct_values(series):
+    """Distinct values of a column as strings, with missing values as ""."""
+    return series.astype(object).fillna("").astype(str).unique()
+
+
+class DictionaryEncoder:
+    """Maps the values of a column to integer codes, growing the lookup table as chunks arrive."""
+
+    def __init__(self):
+        self.values = []
+        self._codes = {}
+
+    def _code(self, value):
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def encode(self, series):
+        codes, uniques = pd.factorize(series.astype(object).fillna("").astype(str))
+        lookup = np.array([self._code(v) for v in uniques], dtype=np.int64)
+        return lookup[codes]
+
+
+class CountCube:
+    """Ticket counts per distinct combination of ``dims`` values, built chunk by chunk.
+
+    Cells are kept in order of first appearance, so charts that rank ties by
+    first appearance come out the same as when counting the rows themselves.
+    """
+
+    def __init__(self, dims):
+        self.dims = list(dims)
+        self.encoders = {dim: DictionaryEncoder() for dim in self.dims}
+        self.counts = {}
+
+    def __len__(self):
+        return len(self.counts)
+
+    def add(self, df):
+        codes = pd.DataFrame({
+            dim: self.encoders[dim].encode(df[dim] if dim in df.columns else pd.Series("", index=df.index))
+            for dim in self.dims
+        })
+        sizes = codes.groupby(self.dims, sort=False).size()
+        for cell, n in zip(sizes.index, sizes.to_numpy()):
+            self.counts[cell] = self.counts.get(cell, 0) + int(n)
+
+    def drop(self, dim):
+        """Sum the cells over ``dim`` and take it out of the cube.
+
+        The remaining cells keep their order of first appearance, so the
+        cube is the one counted without ``dim`` in the first place.
+        """
+        i = self.dims.index(dim)
+        counts = {}
+        for cell, n in self.counts.items():
+            rest = cell[:i] + cell[i + 1:]
+            counts[rest] = counts.get(rest, 0) + n
+        self.counts = counts
+        del self.dims[i]
+        del self.encoders[dim]
+
+    def payload(self):
+        """Lookup tables, the code columns of the cells and their counts."""
+        cells = np.array(list(self.counts), dtype=np.int64).reshape(-1, len(self.dims))
+        return {
+            "length": len(self.counts),
+            "dims": self.dims,
+            "dicts": {dim: self.encoders[dim].values for dim in self.dims},
+            "columns": {dim: cells[:, i].tolist() for i, dim in enumerate(self.dims)},
+            "counts": list(self.counts.values()),
+        }
+
+
+def drop_unused_hours(cube, min_time, max_time):
+    """Roll ``cube`` up to days if its tickets span more than HOURLY_MAX_DAYS days."""
+    if "fail_hour" not in cube.dims or pd.isna(min_time):
+        return
+    if (max_time.normalize() - min_time.normalize()).days + 1 > HOURLY_MAX_DAYS:
+        cube.drop("fail_hour")
+
+
+def raw_values(series):
+    """A column as the page shows it: datetimes as text, missing values as ""."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype(object)
+    elif pd.api.types.is_datetime64_any_dtype(series):
+        series = series.astype(str).where(series.notna(), "")
+    # Fill NaNs for safeguard in JS
+    return series.fillna("")
+
+
+class RawTable:
+    """The full rows for "Download Raw Data", serialized column by column as chunks arrive.
+
+    Each column is kept in a temporary file of its own. Columns of the count
+    cube (``encoders``) are written as their codes into the cube's lookup
+    tables, which the page already has, and columns that are empty in every
+    row are left out; the page puts both back (see rawRows in the page).
+    """
+
+    def __init__(self, encoders=None):
+        self.encoders = encoders or {}
+        self.columns = None
+        self.length = 0
+        self._files = {}
+        self._filled = set()
+
+    def add(self, df):
+        if self.columns is None:
+            self.columns = list(df.columns)
+            self._files = {col: tempfile.TemporaryFile("w+", encoding="utf-8") for col in self.columns}
+        if df.empty:
+            return
+        for col in self.columns:
+            values = raw_values(df[col]) if col in df.columns else pd.Series("", index=df.index)
+            if col in self.encoders:
+                values = self.encoders[col].encode(values)
+            elif (values != "").any():
+                self._filled.add(col)
+            # Embedded in a <script> block, so "</script>" in a message must not end it
+            text = json.dumps(values.tolist()).replace("</", "<\\/")
+            self._files[col].write(("," if self.length else "") + text[1:-1])
+        self.length += len(df)
+
+    def write_payload(self, out):
+        """Write {columns, length, codes: the cube's columns, data: {column: values}}."""
+        columns = self.columns or []
+        codes = [col for col in columns if col in self.encoders]
+        header = json.dumps({"columns": columns, "length": self.length, "codes": codes}).replace("</", "<\\/")
+        out.write(header[:-1] + ', "data": {')
+        written = [col for col in columns if col in self.encoders or col in self._filled]
+        for k, col in enumerate(written):
+            out.write((", " if k else "") + json.dumps(col).replace("</", "<\\/") + ": [")
+            self._files[col].seek(0)
+            shutil.copyfileobj(self._files[col], out)
+            out.write("]")
+        out.write("}}")
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+
+
+def write_cube_payload(out, cube):
+    """Write the chart/filter payload (see CountCube.payload)."""
+    out.write(json.dumps(cube.payload()).replace("</", "<\\/"))
+
+
+def write_gzip(write_payload, fileobj):
+    """Gzip the text ``write_payload(out)`` writes into the binary ``fileobj``."""
+    with gzip.GzipFile(fileobj=fileobj, mode="wb", mtime=0) as gz:
+        text = io.TextIOWrapper(gz, encoding="utf-8")
+        write_payload(text)
+        text.flush()
+        text.detach()
+
+
+def write_base64(src, out, block_size=3 << 20):
+    """Copy the binary file ``src`` into the text stream ``out`` as base64."""
+    # Blocks are a multiple of 3 bytes, so the encoded pieces join without padding
+    src.seek(0)
+    for block in iter(lambda: src.read(block_size), b""):
+        out.write(base64.b64encode(block).decode("ascii"))
+
+
+def data_block(block_id, placeholder, sidecar):
+    """<script> element holding a data payload, stored as PAYLOAD_COMPRESSION says."""
+    if PAYLOAD_COMPRESSION is None:
+        return f'<script type="application/json" id="{block_id}">{placeholder}</script>'
+    if PAYLOAD_COMPRESSION == "embedded":
+        return f'<script type="application/octet-stream" id="{block_id}" data-encoding="gzip-base64">{placeholder}</script>'
+    src = os.path.basename(sidecar)
+    return f'<script type="application/octet-stream" id="{block_id}" data-encoding="gzip" data-src="{src}">{placeholder}</script>'
+
+
+def write_data_block(f, write_payload, sidecar):
+    """Write the payload for a data_block() into the page ``f`` (or its sidecar file)."""
+    if PAYLOAD_COMPRESSION is None:
+        write_payload(f)
+    elif PAYLOAD_COMPRESSION == "embedded":
+        with tempfile.TemporaryFile() as packed:
+            write_gzip(write_payload, packed)
+            write_base64(packed, f)
+    else:
+        with open(sidecar + ".tmp", "wb") as out:
+            write_gzip(write_payload, out)
+        os.replace(sidecar + ".tmp", sidecar)
+
+
+def expand_inputs(patterns):
+    """The files matching ``patterns`` (paths or glob patterns), sorted by name."""
+    paths = set()
+    for pattern in patterns:
+        paths.update(glob.glob(pattern) if glob.has_magic(pattern) else [pattern])
+    return sorted(paths, key=os.path.basename)
+
+
+def merged_exports(paths, jobs=None):
+    """Prepare several exports in parallel and merge them into one row per ticket.
+
+    Each file is read, normalized and cached by its own process (see
+    load_export). Tickets found in several snapshots are matched by fail_id
+    (see ticket_store.ticket_keys) and the row of the newest export wins:
+    the last one by file name, as exports are named tickets_<timestamp>.csv.
+    """
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        frames = list(pool.map(load_export, paths, repeat(CACHE_DIR), repeat(CSV_ENGINE)))
+    df = pd.concat(frames, ignore_index=True)
+    keys = ticket_keys(df, pd.util.hash_pandas_object(df, index=False))
+    return df[~keys.duplicated(keep="last").to_numpy()].reset_index(drop=True)
+
+
+def streamed_exports(paths, cache, pool=None):
+    """merged_exports() a chunk at a time: the same rows, prepared, in the same order.
+
+    The exports are read twice. The first pass only keeps a 64-bit hash of
+    every row's ticket key, to find the last row of each ticket; the second
+    prepares and yields just those rows. Memory grows by a few bytes per
+    row instead of with the size of the exports.
+    """
+    hashes = []
+    for path in paths:
+        for chunk in iter_ticket_chunks(path, CHUNKSIZE, engine=CSV_ENGINE):
+            keys = ticket_keys(chunk, pd.util.hash_pandas_object(chunk, index=False))
+            hashes.append(pd.util.hash_array(keys.to_numpy()))
+    if not hashes:
+        return
+    newest = ~pd.Series(np.concatenate(hashes)).duplicated(keep="last").to_numpy()
+    del hashes
+
+    offset = 0
+    for path in paths:
+        for chunk in iter_ticket_chunks(path, CHUNKSIZE, engine=CSV_ENGINE):
+            keep = newest[offset:offset + len(chunk)]
+            offset += len(chunk)
+            if keep.any():
+                yield prepare_tickets(chunk[keep].reset_index(drop=True), cache, pool)
+
+
+def prepared_chunks(paths, cache, jobs=None, pool=None, compact=False):
+    """Yield the tickets of the exports ``paths``, prepared, as one or more DataFrames.
+
+    Several exports are merged by merged_exports() (streamed_exports() with
+    STREAMING), or ingested one after the other with USE_TICKET_STORE.
+    The processes of ``pool`` (see normalization.normalization_pool) normalize
+    each export or chunk that is prepared here.
+    ``compact`` compacts every partition of the ticket store after the ingest,
+    not only those past COMPACT_THRESHOLD.
+    """
+    if len(paths) > 1 and not USE_TICKET_STORE:
+        if STREAMING:
+            yield from streamed_exports(paths, cache, pool)
+        else:
+            yield merged_exports(paths, jobs)
+        return
+    if not STREAMING and not USE_TICKET_STORE:
+        # Whole-file mode reuses the prepared frame cached by either entry point
+        yield load_prepared_tickets(paths[0], CACHE_DIR, engine=CSV_ENGINE, cache=cache, pool=pool)
+        return
+    if not USE_TICKET_STORE:
+        for chunk in iter_ticket_chunks(paths[0], CHUNKSIZE, engine=CSV_ENGINE):
+            yield prepare_tickets(chunk, cache, pool)
+        return
+
+    with TicketStore(TICKET_STORE_DIR) as store:
+        new = changed = 0
+        for path in paths:
+            for chunk in iter_ticket_chunks(path, CHUNKSIZE, engine=CSV_ENGINE):
+                n, c = store.ingest(chunk, cache, pool, snapshot=export_snapshot(path))
+                new += n
+                changed += c
+        compacted = store.compact(None if compact else COMPACT_THRESHOLD)
+    print(f"Ticket store: {new} new, {changed} changed, {len(store)} total tickets"
+          f" ({compacted} partitions compacted).")
+    yield from store.iter_current()
+
+
+# The page, filled in by main() with str.format (literal braces are doubled)
+PAGE_TEMPLATE = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -172,7 +380,7 @@ html_content = f"""
     <!-- Plotly.js -->
     <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
     <!-- PapaParse for CSV parsing -->
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/PapaParse/5.3.0/papaparse.min.js"></script>
+    <script src="{PAPAPARSE_URL}"></script>
     <style>
         body {{
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
@@ -253,6 +461,16 @@ html_content = f"""
             opacity: 0;
             cursor: pointer;
         }}
+        .upload-status {{
+            display: flex;
+            align-items: center;
+            gap: 10px;
+            color: #555;
+        }}
+        .upload-status progress {{
+            display: none;
+            width: 150px;
+        }}
         .reset-btn {{
             background-color: #e74c3c;
             color: white;
@@ -386,14 +604,18 @@ html_content = f"""
                 <button class="file-upload-btn">📂 Upload CSV File</button>
                 <input type="file" id="csvFileInput" accept=".csv" onchange="handleFileUpload(event)">
             </div>
+            <div class="upload-status">
+                <progress id="uploadProgress" max="1" value="0"></progress>
+                <span id="uploadStatus"></span>
+            </div>
 
             <div class="control-group">
                 <label for="startDate">Start Date:</label>
-                <input type="date" id="startDate" value="{min_date}">
+                <input type="date" id="startDate" value="{min_date}" onchange="updateDashboard()">
             </div>
             <div class="control-group">
                 <label for="endDate">End Date:</label>
-                <input type="date" id="endDate" value="{max_date}">
+                <input type="date" id="endDate" value="{max_date}" onchange="updateDashboard()">
             </div>
             
             <div class="control-group">
@@ -410,6 +632,11 @@ html_content = f"""
                 </select>
             </div>
 
+            <div class="control-group">
+                <input type="checkbox" id="gzipExport">
+                <label for="gzipExport">Compress downloads (.csv.gz)</label>
+            </div>
+
             <button class="global-reset" onclick="resetAllFilters()">Clear All Selection</button>
         </div>
 
@@ -427,6 +654,13 @@ html_content = f"""
                 <div class="chart-title">Trend Failure</div>
                 <div class="chart-actions">
                     <button class="reset-btn" id="btn-reset-date" onclick="clearFilter('date')" style="display:none;">Clear Selection</button>
+                    <select id="timeResolution" onchange="updateDashboard()" title="Timeline resolution">
+                        <option value="auto">Auto</option>
+                        {hour_option}
+                        <option value="day">Day</option>
+                        <option value="week">Week</option>
+                        <option value="month">Month</option>
+                    </select>
                     <button class="action-btn" onclick="maximizeChart('timelineGraph', 'Trend Failure')">Maximize</button>
                     <button class="action-btn" style="background-color: #27ae60; color: white;" onclick="downloadRawData()">Download Raw Data</button>
                 </div>
@@ -515,10 +749,31 @@ html_content = f"""
     </div>
 
     <script>
-        let rawData = {json_data};
+        // Count cube over the chart/filter columns: one cell per distinct combination
+        // of values, column-wise as a lookup table and a typed array of codes per
+        // column (dataset.dicts / dataset.codes) plus the ticket count of each cell
+        // (dataset.counts). Loaded from the cubeData block once the page is ready.
+        const DIMENSIONS = {js_dimensions};
+        // The timeline's column (hours or days), counted in the cube but not filtered on.
+        // Hours are only kept while the tickets span at most HOURLY_MAX_DAYS days;
+        // a dataset without them draws its timeline from date_str, see timeDimension().
+        const TIME_DIMENSION = {js_time_dimension};
+        const CUBE_DIMENSIONS = DIMENSIONS.includes(TIME_DIMENSION) ? DIMENSIONS : DIMENSIONS.concat([TIME_DIMENSION]);
+        const HOURLY_MAX_DAYS = {hourly_max_days};
+        let dataset = null;
+        // Full rows, only used for "Download Raw Data", see getRawTable()
+        let rawTable = null;
         let uniqueModels = {js_models};
         let uniqueResults = {js_results};
 
+        // Error normalization (generated from error_rules.RULES)
+        {JS_NORMALIZER}
+        const errorRulesSpec = {js_rules};
+        const errorRules = compileErrorRules(errorRulesSpec);
+        const PAPAPARSE_URL = {js_papaparse_url};
+        // Top-N limits per chart / sunburst level (CHART_TOP_N etc. in the generator)
+        const LOD = {js_lod};
+
         // State for click-interactions
         // State for click-interactions
         let selectedClickFilters = {{
@@ -531,28 +786,534 @@ html_content = f"""
 
         // Helper separator for IDs in Sunburst
         const sep = "^^";
+        // Marks "Other" buckets (customdata of bars/slices, last part of sunburst ids)
+        const OTHER = "\\u0001other";
+
+        // Largest n [label, count] entries, sorted, plus one "Other" entry for the rest
+        function withOther(entries, n) {{
+            const top = topK(entries, n);
+            if (top.length < entries.length) {{
+                let rest = 0;
+                top.forEach(e => {{ rest -= e[1]; }});
+                entries.forEach(e => {{ rest += e[1]; }});
+                top.push([`Other (${{entries.length - top.length}} more)`, rest]);
+            }}
+            return top;
+        }}
+        function otherMarks(entries, n) {{
+            return entries.map((e, i) => i >= n ? OTHER : null);
+        }}
+
+        // Per-code masks of the filters currently applied and the tickets they match (for download)
+        let currentFilters = null;
+        let currentCount = 0;
+
+        // --- Count cube ---
+        function codeArray(dict, n) {{
+            return dict.length <= 65536 ? new Uint16Array(n) : new Int32Array(n);
+        }}
+
+        function hydrateColumns(payload) {{
+            const ds = {{length: payload.length, dims: payload.dims, dicts: {{}}, codes: {{}}}};
+            payload.dims.forEach(d => {{
+                ds.dicts[d] = payload.dicts[d];
+                ds.codes[d] = codeArray(payload.dicts[d], payload.length);
+                ds.codes[d].set(payload.columns[d]);
+            }});
+            ds.counts = Int32Array.from(payload.counts);
+            // Reused by processData for the indexes of matching cells
+            ds.selection = new Int32Array(payload.length);
+            // value -> code, to match full rows against the filter masks
+            ds.index = {{}};
+            payload.dims.forEach(d => {{
+                ds.index[d] = new Map(payload.dicts[d].map((v, c) => [v, c]));
+            }});
+            buildBitmaps(ds);
+            return ds;
+        }}
+
+        // 1 for every code of column dim whose value passes test, else 0
+        function codeMask(dim, test) {{
+            const dict = dataset.dicts[dim];
+            const mask = new Uint8Array(dict.length);
+            for (let c = 0; c < dict.length; c++) mask[c] = test(dict[c]) ? 1 : 0;
+            return mask;
+        }}
+
+        // --- Bitmap indexes ---
+        // One bitset over the cube cells per value of every filter column. Columns whose
+        // bitsets fit in BITMAP_BUDGET words are indexed up front in one pass; the
+        // values of larger ones get their bitset built the first time they are used.
+        const BITMAP_BUDGET = 1 << 24;
+
+        function buildBitmaps(ds) {{
+            ds.words = (ds.length + 31) >>> 5;
+            ds.bitmaps = {{}};
+            ds.scratch = new Uint32Array(ds.words);
+            DIMENSIONS.forEach(d => {{
+                const size = ds.dicts[d].length;
+                if (size * ds.words > BITMAP_BUDGET) {{
+                    ds.bitmaps[d] = new Array(size).fill(null);
+                    return;
+                }}
+                const maps = ds.bitmaps[d] = Array.from({{length: size}}, () => new Uint32Array(ds.words));
+                const col = ds.codes[d];
+                for (let i = 0; i < ds.length; i++) maps[col[i]][i >>> 5] |= 1 << (i & 31);
+            }});
+        }}
+
+        function valueBitmap(dim, code) {{
+            let bm = dataset.bitmaps[dim][code];
+            if (!bm) {{
+                bm = dataset.bitmaps[dim][code] = new Uint32Array(dataset.words);
+                const col = dataset.codes[dim];
+                for (let i = 0; i < dataset.length; i++) if (col[i] === code) bm[i >>> 5] |= 1 << (i & 31);
+            }}
+            return bm;
+        }}
+
+        // bits &= cells whose dim code passes mask, as an OR over the value bitsets
+        // of whichever side (passing or failing codes) is smaller
+        function andMask(bits, dim, mask) {{
+            let pass = 0;
+            for (let c = 0; c < mask.length; c++) pass += mask[c];
+            if (pass === mask.length) return;
+            if (pass === 0) {{ bits.fill(0); return; }}
+            const want = pass * 2 <= mask.length ? 1 : 0;
+            const union = dataset.scratch;
+            union.fill(0);
+            for (let c = 0; c < mask.length; c++) {{
+                if (mask[c] !== want) continue;
+                const bm = valueBitmap(dim, c);
+                for (let w = 0; w < union.length; w++) union[w] |= bm[w];
+            }}
+            if (want) for (let w = 0; w < bits.length; w++) bits[w] &= union[w];
+            else for (let w = 0; w < bits.length; w++) bits[w] &= ~union[w];
+        }}
+
+        function popcount(x) {{
+            x -= (x >>> 1) & 0x55555555;
+            x = (x & 0x33333333) + ((x >>> 2) & 0x33333333);
+            return (((x + (x >>> 4)) & 0x0F0F0F0F) * 0x01010101) >>> 24;
+        }}
+
+        // --- Timeline rollups ---
+        // Per resolution, the sorted bucket labels and the bucket of every
+        // TIME_DIMENSION code (-1 without fail_time). Built once per dataset from
+        // its distinct hours (or days), so a redraw only sums the filtered time
+        // codes into buckets. Weeks start on Monday and are labelled by that day.
+        const RESOLUTIONS = ["hour", "day", "week", "month"];
+        // Finest resolution used automatically for a date range of up to this many days
+        const AUTO_RESOLUTION_DAYS = {{hour: HOURLY_MAX_DAYS, day: 92, week: 731, month: Infinity}};
+        const RESOLUTION_TITLES = {{hour: 'Hour', day: 'Date', week: 'Week', month: 'Month'}};
+        let timelineResolution = null; // the one last drawn, for clicks
+
+        function timeBucket(res, v) {{
+            const day = v.slice(0, 10);
+            if (res === "hour") return v.slice(0, 13) + ":00";
+            if (res === "day") return day;
+            if (res === "month") return day.slice(0, 7);
+            // From the date's fields, so the time zone plays no part
+            const d = new Date(Date.UTC(+day.slice(0, 4), +day.slice(5, 7) - 1, +day.slice(8, 10)));
+            d.setUTCDate(d.getUTCDate() - (d.getUTCDay() + 6) % 7);
+            return d.toISOString().slice(0, 10);
+        }}
+
+        // The cube column the timeline of ds is drawn from
+        function timeDimension(ds) {{
+            return ds.dims.includes(TIME_DIMENSION) ? TIME_DIMENSION : "date_str";
+        }}
+
+        function timeRollups(ds) {{
+            const dim = timeDimension(ds);
+            const values = ds.dicts[dim];
+            const rollups = {{}};
+            RESOLUTIONS.forEach(res => {{
+                if (res === "hour" && dim !== "fail_hour") return;
+                const keys = values.map(v => v ? timeBucket(res, v) : null);
+                const labels = Array.from(new Set(keys.filter(k => k !== null))).sort();
+                const bucket = new Map(labels.map((k, b) => [k, b]));
+                rollups[res] = {{labels: labels, of: Int32Array.from(keys, k => k === null ? -1 : bucket.get(k))}};
+            }});
+            return rollups;
+        }}
+
+        // The manual choice (if the dataset has it), else the finest resolution for
+        // the selected date range
+        function pickResolution(rollups) {{
+            const chosen = document.getElementById('timeResolution').value;
+            if (rollups[chosen]) return chosen;
+            let days = 1;
+            if (!selectedClickFilters.date) {{
+                const known = rollups.day.labels;
+                const start = document.getElementById('startDate').value || known[0];
+                const end = document.getElementById('endDate').value || known[known.length - 1];
+                if (start && end) days = (Date.parse(end) - Date.parse(start)) / 86400000 + 1;
+            }}
+            return RESOLUTIONS.find(res => rollups[res] && days <= AUTO_RESOLUTION_DAYS[res]);
+        }}
+
+        // First and last day (YYYY-MM-DD) with tickets in a bucket of the timeline
+        function bucketDays(res, label) {{
+            const roll = dataset.rollups[res];
+            const b = roll.labels.indexOf(label);
+            let first = null, last = null;
+            dataset.dicts[timeDimension(dataset)].forEach((v, c) => {{
+                if (roll.of[c] !== b) return;
+                const day = v.slice(0, 10);
+                if (!first || day < first) first = day;
+                if (!last || day > last) last = day;
+            }});
+            return [first, last];
+        }}
+
+        // --- Aggregation ---
+        // Every group-by the charts need, in one pass over the selected cells:
+        // tickets per timeDimension(), test item and error code (with the codes in order of
+        // first appearance), and per (model, test item, error) combination.
+        function aggregateCells(sel) {{
+            const dicts = dataset.dicts, codes = dataset.codes, cellCounts = dataset.counts;
+            const timeDim = timeDimension(dataset);
+            const times = codes[timeDim], models = codes.model, items = codes.test_item, errors = codes.Analyzed_Error;
+            const nItems = dicts.test_item.length;
+            const nErrors = dicts.Analyzed_Error.length;
+            const byTime = {{counts: new Int32Array(dicts[timeDim].length), order: []}};
+            const byItem = {{counts: new Int32Array(nItems), order: []}};
+            const byError = {{counts: new Int32Array(nErrors), order: []}};
+            const combos = new Map();
+
+            for (let k = 0; k < sel.length; k++) {{
+                const i = sel[k];
+                const w = cellCounts[i];
+                const hc = times[i], tc = items[i], ec = errors[i];
+                if (byTime.counts[hc] === 0) byTime.order.push(hc);
+                byTime.counts[hc] += w;
+                if (byItem.counts[tc] === 0) byItem.order.push(tc);
+                byItem.counts[tc] += w;
+                if (byError.counts[ec] === 0) byError.order.push(ec);
+                byError.counts[ec] += w;
+                const key = (models[i] * nItems + tc) * nErrors + ec;
+                combos.set(key, (combos.get(key) || 0) + w);
+            }}
+            return {{byTime, byItem, byError, combos}};
+        }}
+
+        // The k entries with the largest counts, in the order a stable descending
+        // sort would give, without sorting everything
+        function topK(entries, k) {{
+            const top = [];
+            for (const e of entries) {{
+                if (top.length === k && e[1] <= top[k - 1][1]) continue;
+                let j = top.length;
+                while (j > 0 && top[j - 1][1] < e[1]) j--;
+                top.splice(j, 0, e);
+                if (top.length > k) top.pop();
+            }}
+            return top;
+        }}
+
+        // --- Embedded data ---
+        // Data blocks hold plain JSON, gzip+base64 (data-encoding="gzip-base64") or
+        // point at a gzipped sidecar file (data-encoding="gzip", data-src)
+        function base64Stream(text, blockSize = 1 << 22) {{
+            // Decoded a block at a time (multiple of 4 chars) to avoid one huge binary string
+            const parts = [];
+            for (let i = 0; i < text.length; i += blockSize) {{
+                const bin = atob(text.slice(i, i + blockSize));
+                const bytes = new Uint8Array(bin.length);
+                for (let j = 0; j < bin.length; j++) bytes[j] = bin.charCodeAt(j);
+                parts.push(bytes);
+            }}
+            return new Blob(parts).stream();
+        }}
 
-        // Data currently shown (for download)
-        let currentFilteredData = [];
+        async function readPayload(id) {{
+            const el = document.getElementById(id);
+            const encoding = el.getAttribute('data-encoding');
+            if (!encoding) return JSON.parse(el.textContent);
+
+            let body;
+            if (el.getAttribute('data-src')) {{
+                const response = await fetch(el.getAttribute('data-src'));
+                if (!response.ok) throw new Error(`Could not load ${{el.getAttribute('data-src')}} (${{response.status}})`);
+                body = response.body;
+            }} else {{
+                body = base64Stream(el.textContent.trim());
+            }}
+            // Decompressed and decoded as it streams in; parsed once complete
+            const reader = body.pipeThrough(new DecompressionStream('gzip')).pipeThrough(new TextDecoderStream()).getReader();
+            const chunks = [];
+            for (;;) {{
+                const {{done, value}} = await reader.read();
+                if (done) break;
+                chunks.push(value);
+            }}
+            return JSON.parse(chunks.join(''));
+        }}
+
+        // The rawTable payload (RawTable in the generator) back as full rows. Its
+        // cube columns are codes into the lookup tables of the embedded cube,
+        // which is still in dataset: an upload replaces both dataset and rawTable.
+        function rawRows(payload) {{
+            const columns = payload.columns.map(c => ({{
+                values: payload.data[c],
+                dict: payload.codes.includes(c) ? dataset.dicts[c] : null
+            }}));
+            const rows = new Array(payload.length);
+            for (let i = 0; i < payload.length; i++) {{
+                const row = new Array(columns.length);
+                for (let j = 0; j < columns.length; j++) {{
+                    const {{values, dict}} = columns[j];
+                    // Columns without values were empty in every row
+                    row[j] = values === undefined ? "" : dict ? dict[values[i]] : values[i];
+                }}
+                rows[i] = row;
+            }}
+            return {{columns: payload.columns, rows: rows}};
+        }}
+
+        async function getRawTable() {{
+            if (!rawTable) rawTable = rawRows(await readPayload('rawTable'));
+            return rawTable;
+        }}
 
         // --- File Upload Handler ---
-        function handleFileUpload(event) {{
-            const file = event.target.files[0];
-            if (!file) return;
+        // Uploads are parsed, normalized and aggregated into a count cube by
+        // uploadPipeline inside a Web Worker, so the page stays responsive; rows
+        // are streamed back a Papa chunk at a time for the progress indicator and
+        // for "Download Raw Data".
+        let uploadWorker = null;
+
+        // Reports through post(msg, transfer): {{type: 'rows'}} after every chunk,
+        // then {{type: 'done'}} with the hydrated dataset, or {{type: 'error'}}
+        function uploadPipeline(file, dims, errorRules, post) {{
+            const dicts = {{}};
+            const index = {{}};
+            dims.forEach(d => {{ dicts[d] = []; index[d] = new Map(); }});
+            let cells = new Map();
+            const codes = new Array(dims.length);
+            const models = new Set();
+            const results = new Set();
+            let minD = null;
+            let maxD = null;
+            let columns = null;
+            let count = 0;
+
+            // Cube columns computed per row that are not columns of the export
+            const derived = {{fail_hour: ""}};
+            // fail_time as the export writes it (FAIL_TIME_FORMAT). Its day and hour
+            // are read off the text, as the generator does: they are local times,
+            // which a Date would turn into UTC ones.
+            const FAIL_TIME_RE = /^\\d{{4}}-\\d{{2}}-\\d{{2}} \\d{{2}}:\\d{{2}}:\\d{{2}}$/;
+            const pad2 = n => String(n).padStart(2, '0');
+
+            // Clean and transform a row (Mirroring Python logic)
+            // 1. fail_time -> date_str (YYYY-MM-DD), and fail_hour (YYYY-MM-DD HH) for the cube
+            // 2. error_message_nor (or error_message) -> Analyzed_Error (clean timestamp)
+            function processRow(row) {{
+                // Date Processing
+                let dateStr = "";
+                derived.fail_hour = "";
+                if (row.fail_time && FAIL_TIME_RE.test(row.fail_time)) {{
+                    dateStr = row.fail_time.slice(0, 10);
+                    derived.fail_hour = dateStr + " " + row.fail_time.slice(11, 13);
+                }} else if (row.fail_time) {{
+                    // Any other format: its local date and hour, like pandas' naive parse
+                    const d = new Date(row.fail_time);
+                    if (!isNaN(d.getTime())) {{
+                        dateStr = d.getFullYear() + "-" + pad2(d.getMonth() + 1) + "-" + pad2(d.getDate());
+                        derived.fail_hour = dateStr + " " + pad2(d.getHours());
+                    }}
+                }}
+                row.date_str = dateStr;
+
+                // Error Processing
+                // Prioritize Analyzed_Error if it exists in the row, otherwise error_message_nor, otherwise Unknown.
+                let rawError = row.Analyzed_Error || row.error_message_nor || "Unknown";
+                
+                // Remove the "YYYY-MM-DD HH:MM:SS | ERROR | " prefixes, then standardize
+                row.Analyzed_Error = errorRules.clean(rawError);
+
+                // Ensure test_item exists (trim whitespace if present)
+                if(row.test_item) row.test_item = row.test_item.trim();
+            }}
+
+            // Same cells, in order of first appearance, as CountCube in generate_dashboard.py
+            function addToCube(row) {{
+                for (let j = 0; j < dims.length; j++) {{
+                    const d = dims[j];
+                    const v = d in derived ? derived[d] : row[d] == null ? "" : row[d];
+                    let c = index[d].get(v);
+                    if (c === undefined) {{
+                        c = dicts[d].length;
+                        index[d].set(v, c);
+                        dicts[d].push(v);
+                    }}
+                    codes[j] = c;
+                }}
+                const key = codes.join(",");
+                const cell = cells.get(key);
+                if (cell) cell.count++;
+                else cells.set(key, {{codes: codes.slice(), count: 1}});
+            }}
+
+            // Sum the cells over column dim and leave it out, as CountCube.drop does
+            function dropDimension(dim) {{
+                const j = dims.indexOf(dim);
+                const rolled = new Map();
+                cells.forEach(cell => {{
+                    const rest = cell.codes.filter((c, i) => i !== j);
+                    const key = rest.join(",");
+                    const prev = rolled.get(key);
+                    if (prev) prev.count += cell.count;
+                    else rolled.set(key, {{codes: rest, count: cell.count}});
+                }});
+                cells = rolled;
+                dims = dims.filter(d => d !== dim);
+                delete dicts[dim];
+            }}
 
             Papa.parse(file, {{
                 header: true,
                 skipEmptyLines: true,
-                complete: function(results) {{
-                    processUploadedData(results.data);
+                chunk: function(chunk) {{
+                    const rows = new Array(chunk.data.length);
+                    chunk.data.forEach((row, k) => {{
+                        processRow(row);
+                        addToCube(row);
+                        if (!columns) columns = Object.keys(row);
+                        rows[k] = columns.map(c => row[c]);
+                        if(row.model) models.add(row.model);
+                        if(row.result) results.add(row.result);
+                        if(row.date_str) {{
+                            if(!minD || row.date_str < minD) minD = row.date_str;
+                            if(!maxD || row.date_str > maxD) maxD = row.date_str;
+                        }}
+                    }});
+                    count += rows.length;
+                    const progress = file.size ? Math.min(1, chunk.meta.cursor / file.size) : 1;
+                    post({{type: 'rows', columns: columns, rows: rows, count: count, progress: progress}});
+                }},
+                complete: function() {{
+                    // Hours only for spans the timeline draws by the hour (HOURLY_MAX_DAYS)
+                    const days = minD ? (Date.parse(maxD) - Date.parse(minD)) / 86400000 + 1 : 0;
+                    if (dims.includes("fail_hour") && days > HOURLY_MAX_DAYS) dropDimension("fail_hour");
+                    const columnCodes = {{}};
+                    dims.forEach((d, j) => {{ columnCodes[d] = Array.from(cells.values(), cell => cell.codes[j]); }});
+                    const ds = hydrateColumns({{
+                        length: cells.size,
+                        dims: dims,
+                        dicts: dicts,
+                        columns: columnCodes,
+                        counts: Array.from(cells.values(), cell => cell.count)
+                    }});
+                    // The typed arrays are handed over to the page rather than copied
+                    const buffers = [ds.counts.buffer, ds.selection.buffer, ds.scratch.buffer];
+                    dims.forEach(d => buffers.push(ds.codes[d].buffer));
+                    Object.values(ds.bitmaps).forEach(maps => maps.forEach(bm => {{ if (bm) buffers.push(bm.buffer); }}));
+                    post({{
+                        type: 'done',
+                        dataset: ds,
+                        count: count,
+                        columns: columns || [],
+                        models: Array.from(models).sort(),
+                        results: Array.from(results).sort(),
+                        minDate: minD,
+                        maxDate: maxD
+                    }}, buffers);
                 }},
                 error: function(error) {{
-                    alert("Error parsing CSV: " + error.message);
+                    post({{type: 'error', message: error.message}});
                 }}
             }});
         }}
 
-        // Initialize listeners function
+        function createUploadWorker() {{
+            // The worker runs the page's own functions, shipped to it as source
+            const source = [
+                `const BITMAP_BUDGET = ${{BITMAP_BUDGET}};`,
+                `const HOURLY_MAX_DAYS = ${{HOURLY_MAX_DAYS}};`,
+                `const DIMENSIONS = ${{JSON.stringify(DIMENSIONS)}};`,
+                `importScripts(${{JSON.stringify(PAPAPARSE_URL)}});`,
+                compileErrorRules, codeArray, buildBitmaps, hydrateColumns, uploadPipeline,
+                `self.onmessage = e => uploadPipeline(e.data.file, e.data.dims, compileErrorRules(e.data.rules),
+                    (msg, transfer) => self.postMessage(msg, transfer || []));`
+            ].map(String).join('\\n');
+            return new Worker(URL.createObjectURL(new Blob([source], {{type: 'text/javascript'}})));
+        }}
+
+        function showUploadProgress(progress, text) {{
+            const bar = document.getElementById('uploadProgress');
+            bar.style.display = progress === null ? 'none' : 'inline-block';
+            if (progress !== null) bar.value = progress;
+            document.getElementById('uploadStatus').textContent = text;
+        }}
+
+        function handleFileUpload(event) {{
+            const file = event.target.files[0];
+            if (!file) return;
+            if (uploadWorker) uploadWorker.terminate();
+            uploadWorker = null;
+
+            const rows = [];
+            const onMessage = (msg) => {{
+                if (msg.type === 'rows') {{
+                    for (let k = 0; k < msg.rows.length; k++) rows.push(msg.rows[k]);
+                    showUploadProgress(msg.progress, `Loading... ${{msg.count}} records`);
+                }} else if (msg.type === 'done') {{
+                    if (uploadWorker) uploadWorker.terminate();
+                    uploadWorker = null;
+                    processUploadedData(msg, rows);
+                }} else {{
+                    showUploadProgress(null, "");
+                    alert("Error parsing CSV: " + msg.message);
+                }}
+            }};
+            // Without Worker support (or if the worker cannot start) parse on the page
+            const runOnPage = () => {{
+                if (uploadWorker) uploadWorker.terminate();
+                uploadWorker = null;
+                rows.length = 0;
+                uploadPipeline(file, CUBE_DIMENSIONS, errorRules, onMessage);
+            }};
+
+            showUploadProgress(0, "Loading...");
+            let worker;
+            try {{
+                worker = uploadWorker = createUploadWorker();
+            }} catch (err) {{
+                return runOnPage();
+            }}
+            worker.onmessage = e => {{
+                // Messages still queued from a worker that was given up on
+                if (worker !== uploadWorker) return;
+                // Not one of uploadPipeline's: an older PapaParse that ran in its own
+                // worker mode and posts {{results, workerId, finished}} itself
+                if (!e.data || !e.data.type) return runOnPage();
+                onMessage(e.data);
+            }};
+            worker.onerror = e => {{
+                e.preventDefault();
+                if (worker === uploadWorker) runOnPage();
+            }};
+            worker.postMessage({{file: file, dims: CUBE_DIMENSIONS, rules: errorRulesSpec}});
+        }}
+
+        // --- Chart rendering ---
+        // Serialized inputs of what each chart div currently shows. Charts are
+        // created on first draw, updated in place with Plotly.react afterwards,
+        // and left alone when their inputs did not change.
+        const drawnCharts = {{}};
+        let listenersAttached = false;
+
+        function drawChart(id, traces, layout) {{
+            const key = JSON.stringify([traces, layout]);
+            if (drawnCharts[id] === key) return;
+            drawnCharts[id] = key;
+            Plotly.react(id, traces, layout);
+        }}
+
+        // Initialize listeners function (once, after the first render)
         function attachListeners() {{
             const ids = ['timelineGraph', 'testItemGraph', 'testItemPie', 'topErrorsGraph', 'topErrorsPie', 'resultGraph'];
             
@@ -564,9 +1325,20 @@ html_content = f"""
                     if(data.points.length > 0) {{
                         const pt = data.points[0];
                         let needsUpdate = false;
+                        // "Other" buckets stand for many values, there is nothing to filter by
+                        if (pt.customdata === OTHER || (pt.id && pt.id.endsWith(OTHER))) return;
 
                         if (id === 'timelineGraph') {{
-                            selectedClickFilters.date = pt.x;
+                            // A day (also the day of an hour) becomes the date filter,
+                            // a week or month becomes the date range
+                            const [first, last] = bucketDays(timelineResolution, pt.customdata);
+                            if (!first) return;
+                            if (timelineResolution === 'week' || timelineResolution === 'month') {{
+                                document.getElementById('startDate').value = first;
+                                document.getElementById('endDate').value = last;
+                            }} else {{
+                                selectedClickFilters.date = first;
+                            }}
                             needsUpdate = true;
                         }} 
                         else if (id === 'testItemGraph') {{
@@ -614,152 +1386,23 @@ html_content = f"""
             }});
         }}
 
-        function processUploadedData(data) {{
-            // Clean and transform data (Mirroring Python logic)
-            // 1. fail_time -> date_str (YYYY-MM-DD)
-            // 2. error_message_nor (or error_message) -> Analyzed_Error (clean timestamp)
-            
-            const processed = data.map(row => {{
-                // Date Processing
-                let dateStr = "";
-                if (row.fail_time) {{
-                    const d = new Date(row.fail_time);
-                    if (!isNaN(d.getTime())) {{
-                        dateStr = d.toISOString().split('T')[0];
-                    }}
-                }}
-                row.date_str = dateStr;
-
-                // Error Processing
-                // Prioritize error_message_nor as requested
-                // Prioritize Analyzed_Error if it exists in the row, otherwise error_message_nor, otherwise Unknown.
-                let rawError = row.Analyzed_Error || row.error_message_nor || "Unknown";
-                
-                // 1. Remove Prefix "YYYY-MM-DD HH:MM:SS | ERROR | "
-                let cleanError = rawError.replace(/\\d{{4}}-\\d{{2}}-\\d{{2}} \\d{{2}}:\\d{{2}}:\\d{{2}} \\| ERROR \\| /, "");
-                
-                // Specific standardization for IPv4/IPv6 address error
-                if (cleanError.includes("does not appear to be an IPv4 or IPv6 address")) {{
-                    cleanError = "'Last login: DATE from XXX.XXX.XXX.XXXstart serial session -i XX -b X\\n\\n\\nip addr\\nWcsCli# start serial session -i XX -b X\\n' does not appear to be an IPv4 or IPv6 address";
-                }} 
-                // Specific standardization for "create account - fail"
-                else if (cleanError.trim().endsWith("create account - fail")) {{
-                    cleanError = "UXX create account - fail";
-                }}
-                // Specific standardization for "timed out. (connect timeout=30)'))"
-                else if (cleanError.trim().endsWith("timed out. (connect timeout=30)'))")) {{
-                    cleanError = "HTTPConnectionPool(host='XXX.XXX.XXX.{id}', port=5985): Max retries exceeded with url: /wsman (Caused by ConnectTimeoutError(<urllib3.connection.HTTPConnection object at XxXXXXXXXXXXXXX>, 'Connection to XXX.XXX.XXX.XXX timed out. (connect timeout=30)'))";
-                }}
-                // Specific standardization for "check BMC FW Version"
-                else if (cleanError.startsWith("check BMC FW Version") && cleanError.includes("Failed to ping")) {{
-                     cleanError = "check BMC FW Version, expected equal to C2195.BC.0406, actual: C2195.BC.0405 - Fail\\nFailed to ping 172.XXX.XXX.XXX, DUT is not reachable.";
-                }}
-                // Specific standardization for "Command [show manager relay -p"
-                else if (cleanError.startsWith("Command [show manager relay -p")) {{
-                     cleanError = "Command [show manager relay -p X] timeout.";
-                }}
-                // Specific standardization for "check DIMM Locator"
-                else if (cleanError.startsWith("check DIMM Locator, expected equal to DIMM_")) {{
-                     cleanError = "check DIMM Locator, expected equal to DIMM_XN, actual: DIMM_XN - Fail\\ncheck DIMM Quantity, expected equal to 12, actual: {{not equality}} - Fail";
-                }}
-                // Specific standardization for "Invalid SFCS stage"
-                else if (cleanError.startsWith("Invalid SFCS stage, expected:")) {{
-                    cleanError = "Invalid SFCS stage, expected: Zz, actual: Xx";
-                }}
-                // Specific standardization for "check sensor Fan_"
-                else if (cleanError.startsWith("check sensor Fan_")) {{
-                    cleanError = "check sensor Fan_Nx reading, expected equal to ok, actual: ns - Fail\\nL10 BMC SDR check fail";
-                }}
-                // Specific standardization for "didn't have device exist in OS"
-                else if (cleanError.trim().endsWith("didn't have device exist in OS")) {{
-                    cleanError = "This BDF XXXX:XX:XX.X didn't have device exist in OS";
-                }}
-                // Specific standardization for "check System SN"
-                else if (cleanError.startsWith("check System SN, expected equal to")) {{
-                    cleanError = "check System SN, expected equal to PXXXXXXXXXXXXXXX, actual: PYYYYYYYYYYYYYYY - Fail";
-                }}
-                // Specific standardization for "TOR switch"
-                else if (cleanError.includes("expected equal to OK, actual: NOT - Fail") && cleanError.includes("TOR switch")) {{
-                    cleanError = "check psuXpwr-511-ac-red, expected equal to OK, actual: NOT - Fail\\nTOR switch M1171500-001 (DATA_SW, UXX) - Fail";
-                }}
-                // Specific standardization for "Failed to process the command: ping -c"
-                else if (cleanError.startsWith("Failed to process the command: ping -c")) {{
-                    cleanError = "Failed to process the command: ping -c X -i X -W XX 172.XX.XX.XX";
-                }}
-                 // Specialized replacement for "check BMC FW Version" and "Command [set system bmc update -i"
-                else if (cleanError.includes("check BMC FW Version") && cleanError.includes("Command [set system bmc update -i")) {{
-                    cleanError = "check BMC FW Version, expected equal to C2195.BC.0406, actual: C2195.BC.0405 - Fail\\nCommand [set system bmc update -i X -f C2195.BC.0406.00.bin] timeout.";
-                }}
-                // Specialized replacement for "Failed to 'GetUSNGenealogyBasic'"
-                else if (cleanError.startsWith("Failed to 'GetUSNGenealogyBasic' with {{'UnitSerialNumber': 'P")) {{
-                    cleanError = "Failed to 'GetUSNGenealogyBasic' with {{'UnitSerialNumber': 'P{{id}}', 'StageCode': 'XX'}}";
-                }}
-                // Specialized replacement for "Failed to execute RM cmd: 'set system psu update -i"
-                else if (cleanError.startsWith("Failed to execute RM cmd: 'set system psu update -i")) {{
-                     cleanError = "Failed to execute RM cmd: 'set system psu update -i X -f File.hex -t X'";
-                }}
-                // Specialized replacement for "<pypsrp.powershell.PSDataStreams object at"
-                else if (cleanError.startsWith("<pypsrp.powershell.PSDataStreams object at")) {{
-                    cleanError = "<pypsrp.powershell.PSDataStreams object at 0x7XXXXXXXXXXXX>\\nrc=True, Failed to execute cmd 'cd ~\\.\\inband_tools\\MPF_latest; .\\s ;'";
-                }}
-                // Specialized replacement for "Get tpm ekcert from sfcs error"
-                else if (cleanError.startsWith("Get tpm ekcert from sfcs error")) {{
-                    cleanError = "Get tpm ekcert from sfcs error, error message: ['NoneType' object has no attribute 'get']\\nGet dcscmsn[M1304365002B5293XXXXXXX] ekcert failed in SFCS/MES.";
-                }}
-                // Specialized replacement for "Unable to send RAW command"
-                else if (cleanError.includes("Unable to send RAW command (channel=0x0 netfn=0x34 lun=0x0 cmd=0x93 rsp=0xd5): Command not supported in present state")) {{
-                    cleanError = "Failed to execute RM cmd: 'set system cmd -i XX -c raw 0x34 0x93 0x01 0x04', 'Completion Code: Failure', 'Status Description: Failed to run command ['raw', '0x{{id}}', '0x{{id}}', '0x{{id}}', '0x{{id}}'] with error: Unable to send RAW command (channel=0x0 netfn=0x34 lun=0x0 cmd=0x93 rsp=0xd5): Command not supported in present state'";
-                }}
-                else {{
-                    // 2. Standardize Patterns
-                    // Date: Fri Jan  9 09:24:01 2026
-                    cleanError = cleanError.replace(/[A-Za-z]{{3}}\\s+[A-Za-z]{{3}}\\s+\\d+\\s+\\d{{2}}:\\d{{2}}:\\d{{2}}\\s+\\d{{4}}/g, "DATE");
-                    // IP: 172.17.6.32
-                    cleanError = cleanError.replace(/\\d{{1,3}}\\.\\d{{1,3}}\\.\\d{{1,3}}\\.\\d{{1,3}}/g, "XXX.XXX.XXX.XXX");
-                    // Session ID: -i 35 -> -i XX
-                    cleanError = cleanError.replace(/-i\\s+\\d+/g, "-i XX");
-                    // Session ID: -b 1 -> -b X
-                    cleanError = cleanError.replace(/-b\\s+\\d+/g, "-b X");
-                }}
-
-                row.Analyzed_Error = cleanError;
+        function processUploadedData(msg, rows) {{
+            // Keep the full rows for download and only the count cube in dataset
+            rawTable = {{columns: msg.columns, rows: rows}};
+            dataset = msg.dataset;
 
-                // Ensure test_item exists (trim whitespace if present)
-                if(row.test_item) row.test_item = row.test_item.trim();
-
-                return row;
-            }});
-
-            rawData = processed;
-            
             // Re-calculate unique values
-            const models = new Set();
-            const results = new Set();
-            
-            // Update Min/Max dates
-            let minD = null;
-            let maxD = null;
-
-            processed.forEach(r => {{
-                if(r.model) models.add(r.model);
-                if(r.result) results.add(r.result);
-                if(r.date_str) {{
-                    if(!minD || r.date_str < minD) minD = r.date_str;
-                    if(!maxD || r.date_str > maxD) maxD = r.date_str;
-                }}
-            }});
-
-            uniqueModels = Array.from(models).sort();
-            uniqueResults = Array.from(results).sort();
+            uniqueModels = msg.models;
+            uniqueResults = msg.results;
 
             // Update UI Controls
-            if(minD) document.getElementById('startDate').value = minD;
-            if(maxD) document.getElementById('endDate').value = maxD;
+            if(msg.minDate) document.getElementById('startDate').value = msg.minDate;
+            if(msg.maxDate) document.getElementById('endDate').value = msg.maxDate;
             
             refreshDropdowns();
             resetAllFilters(); // Helper will call updateDashboard
             
-            alert(`File loaded successfully! ${{processed.length}} records processed.`);
+            showUploadProgress(null, `File loaded successfully! ${{msg.count}} records processed.`);
         }}
 
         function refreshDropdowns() {{
@@ -797,32 +1440,55 @@ html_content = f"""
             const end = endDateInput ? new Date(endDateInput) : new Date('2100-01-01');
             end.setHours(23, 59, 59, 999);
 
-            return rawData.filter(row => {{
+            // Filters are evaluated once per distinct value, then looked up per row by code
+            const dateOk = codeMask('date_str', v => {{
                 // 1. Static Filters (Top Bar)
-                if (row.date_str) {{
-                    const d = new Date(row.date_str);
+                if (v) {{
+                    const d = new Date(v);
                     if (d < start || d > end) return false;
                 }}
-                if (selectedModel !== 'All' && row.model !== selectedModel) return false;
-                if (selectedResult !== 'All' && row.result !== selectedResult) return false;
-
                 // 2. Click Interaction Filters
-                if (selectedClickFilters.date && row.date_str !== selectedClickFilters.date) return false;
-                
-                // Hierarchical & Chart Filters
-                if (selectedClickFilters.model && row.model !== selectedClickFilters.model) return false;
-                if (selectedClickFilters.testItem && row.test_item !== selectedClickFilters.testItem) return false;
-                if (selectedClickFilters.error && row.Analyzed_Error !== selectedClickFilters.error) return false;
-                if (selectedClickFilters.result && row.result !== selectedClickFilters.result) return false;
-
-                return true;
+                return !selectedClickFilters.date || v === selectedClickFilters.date;
             }});
+            // Hierarchical & Chart Filters
+            const modelOk = codeMask('model', v =>
+                (selectedModel === 'All' || v === selectedModel) &&
+                (!selectedClickFilters.model || v === selectedClickFilters.model));
+            const resultOk = codeMask('result', v =>
+                (selectedResult === 'All' || v === selectedResult) &&
+                (!selectedClickFilters.result || v === selectedClickFilters.result));
+            const itemOk = codeMask('test_item', v => !selectedClickFilters.testItem || v === selectedClickFilters.testItem);
+            const errorOk = codeMask('Analyzed_Error', v => !selectedClickFilters.error || v === selectedClickFilters.error);
+
+            currentFilters = {{date_str: dateOk, model: modelOk, result: resultOk, test_item: itemOk, Analyzed_Error: errorOk}};
+
+            // AND of the filters over the bitmap indexes, starting from all cells
+            const bits = new Uint32Array(dataset.words).fill(0xFFFFFFFF);
+            if (dataset.length & 31) bits[dataset.words - 1] = (1 << (dataset.length & 31)) - 1;
+            DIMENSIONS.forEach(d => andMask(bits, d, currentFilters[d]));
+
+            // Matching cells in cube order
+            let count = 0;
+            for (let w = 0; w < bits.length; w++) count += popcount(bits[w]);
+            const sel = dataset.selection.subarray(0, count);
+            let k = 0;
+            for (let w = 0; w < bits.length; w++) {{
+                let word = bits[w];
+                while (word) {{
+                    const low = word & -word;
+                    sel[k++] = (w << 5) + 31 - Math.clz32(low);
+                    word ^= low;
+                }}
+            }}
+            return sel;
         }}
 
         function updateDashboard() {{
+            if (!dataset) return; // still loading
             const data = processData();
-            currentFilteredData = data; // Store for download
-            const totalCount = data.length;
+            let totalCount = 0;
+            for (let k = 0; k < data.length; k++) totalCount += dataset.counts[data[k]];
+            currentCount = totalCount; // Store for download
 
             updateFilterDisplay();
 
@@ -833,20 +1499,29 @@ html_content = f"""
         }}
 
         function renderCharts(data, totalCount) {{
-             // 1. Timeline
-            const dateCounts = {{}};
-            data.forEach(r => {{ if(r.date_str) dateCounts[r.date_str] = (dateCounts[r.date_str] || 0) + 1; }});
-            const sortedDates = Object.keys(dateCounts).sort();
+            const dicts = dataset.dicts;
+            const {{byTime, byItem, byError, combos}} = aggregateCells(data);
+
+             // 1. Timeline, with the time codes rolled up into buckets of the chosen resolution
+            if (!dataset.rollups) dataset.rollups = timeRollups(dataset);
+            timelineResolution = pickResolution(dataset.rollups);
+            const roll = dataset.rollups[timelineResolution];
+            const bucketCounts = new Float64Array(roll.labels.length);
+            byTime.order.forEach(c => {{ if (roll.of[c] >= 0) bucketCounts[roll.of[c]] += byTime.counts[c]; }});
+            const shown = [];
+            bucketCounts.forEach((n, b) => {{ if (n > 0) shown.push(b); }});
+            const buckets = shown.map(b => roll.labels[b]);
             
             const timelineLayout = {{
                 margin: {{t: 10, l: 40}},
-                xaxis: {{title: 'Date'}},
+                xaxis: {{title: RESOLUTION_TITLES[timelineResolution]}},
                 yaxis: {{title: 'Count'}}
             }};
 
-            Plotly.newPlot('timelineGraph', [{{
-                x: sortedDates,
-                y: sortedDates.map(d => dateCounts[d]),
+            drawChart('timelineGraph', [{{
+                x: buckets,
+                y: shown.map(b => bucketCounts[b]),
+                customdata: buckets,
                 type: 'scatter',
                 mode: 'lines+markers',
                 marker: {{color: '#3498db'}},
@@ -857,12 +1532,13 @@ html_content = f"""
 
             // 2. Test Items
             const itemCounts = {{}};
-            data.forEach(r => {{
-                const ti = r.test_item || "Unknown";
-                itemCounts[ti] = (itemCounts[ti] || 0) + 1;
+            byItem.order.forEach(c => {{
+                const ti = dicts.test_item[c] || "Unknown";
+                itemCounts[ti] = (itemCounts[ti] || 0) + byItem.counts[c];
             }});
-            // Show ALL items (removed slice), sorted by count
-            const sortedItems = Object.entries(itemCounts).sort((a,b)=>b[1]-a[1]); 
+            // Largest LOD.chartTopN items, sorted by count, the rest as "Other"
+            const sortedItems = withOther(Object.entries(itemCounts), LOD.chartTopN);
+            const itemMarks = otherMarks(sortedItems, LOD.chartTopN);
 
             // Calculate dynamic width for scrollbar
             const containerWidth = document.getElementById('testItemGraph').parentElement.offsetWidth;
@@ -870,9 +1546,10 @@ html_content = f"""
             const calcWidth = sortedItems.length * itemWidth;
             const finalWidth = Math.max(containerWidth, calcWidth);
 
-            Plotly.newPlot('testItemGraph', [{{
+            drawChart('testItemGraph', [{{
                 x: sortedItems.map(i => i[0]),
                 y: sortedItems.map(i => i[1]),
+                customdata: itemMarks,
                 type: 'bar',
                 marker: {{color: '#9b59b6'}}
             }}], {{
@@ -883,9 +1560,10 @@ html_content = f"""
             }});
 
              // 2b. Test Item Distribution (Pie) - New
-             Plotly.newPlot('testItemPie', [{{
+             drawChart('testItemPie', [{{
                 labels: sortedItems.map(e => e[0]),
                 values: sortedItems.map(e => e[1]),
+                customdata: itemMarks,
                 type: 'pie',
                 textinfo: 'label+percent+value',
                 marker: {{colors: ['#8e44ad', '#9b59b6', '#a569bd', '#af7ac5', '#bb8fce', '#c39bd3', '#d2b4de', '#e8daef', '#f4ecf7', '#f5eef8']}}
@@ -899,13 +1577,12 @@ html_content = f"""
 
             // 3. Top Errors (Bar) - Keep generic top 10
             const errorCounts = {{}};
-            data.forEach(r => {{ errorCounts[r.Analyzed_Error] = (errorCounts[r.Analyzed_Error] || 0) + 1; }});
-            // Sort all errors
-            const allSortedErrors = Object.entries(errorCounts).sort((a,b)=>b[1]-a[1]);
+            byError.order.forEach(c => {{ errorCounts[dicts.Analyzed_Error[c]] = byError.counts[c]; }});
+            const errorEntries = Object.entries(errorCounts);
             // Top 10 for Bar
-            const top10Errors = allSortedErrors.slice(0, 10);
+            const top10Errors = topK(errorEntries, 10);
 
-            Plotly.newPlot('topErrorsGraph', [{{
+            drawChart('topErrorsGraph', [{{
                 x: top10Errors.map(e => e[1]),
                 y: top10Errors.map(e => e[0]),
                 type: 'bar',
@@ -918,10 +1595,12 @@ html_content = f"""
                 yaxis: {{autorange: 'reversed'}}
             }});
             
-            // 3b. Errors Distribution (Pie) - Show ALL
-            Plotly.newPlot('topErrorsPie', [{{
-                labels: allSortedErrors.map(e => e[0]),
-                values: allSortedErrors.map(e => e[1]),
+            // 3b. Errors Distribution (Pie) - largest LOD.chartTopN errors, the rest as "Other"
+            const pieErrors = withOther(errorEntries, LOD.chartTopN);
+            drawChart('topErrorsPie', [{{
+                labels: pieErrors.map(e => e[0]),
+                values: pieErrors.map(e => e[1]),
+                customdata: otherMarks(pieErrors, LOD.chartTopN),
                 type: 'pie',
                 textinfo: 'label+percent+value',
                 marker: {{colors: ['#e74c3c', '#c0392b', '#d35400', '#e67e22', '#f39c12', '#f1c40f', '#2ecc71', '#27ae60', '#16a085', '#1abc9c']}}
@@ -936,19 +1615,31 @@ html_content = f"""
 
             // 4. Error Hierarchy (Sunburst)
             // Hierarchy: Total -> Model -> Test Item -> Analyzed_Error
-            const tree = {{}};
+            // Built from the (model, test item, error) combinations counted by aggregateCells
+            const nItems = dicts.test_item.length;
+            const nErrors = dicts.Analyzed_Error.length;
+            const tree = new Map(); // label -> {{count, children}}
             let totalErrs = 0;
 
-            data.forEach(r => {{
-                const m = r.model || "Unknown";
-                const t = r.test_item || "Unknown";
-                const e = r.Analyzed_Error || "Unknown";
-                
-                if (!tree[m]) tree[m] = {{}};
-                if (!tree[m][t]) tree[m][t] = {{}};
-                if (!tree[m][t][e]) tree[m][t][e] = 0;
-                tree[m][t][e]++;
-                totalErrs++;
+            combos.forEach((count, key) => {{
+                const ec = key % nErrors;
+                const tc = ((key - ec) / nErrors) % nItems;
+                const mc = ((key - ec) / nErrors - tc) / nItems;
+                let level = tree;
+                [
+                    dicts.model[mc] || "Unknown",
+                    dicts.test_item[tc] || "Unknown",
+                    dicts.Analyzed_Error[ec] || "Unknown"
+                ].forEach(label => {{
+                    let node = level.get(label);
+                    if (!node) {{
+                        node = {{count: 0, children: new Map()}};
+                        level.set(label, node);
+                    }}
+                    node.count += count;
+                    level = node.children;
+                }});
+                totalErrs += count;
             }});
 
             const ids = ["Total"];
@@ -965,53 +1656,52 @@ html_content = f"""
             ];
             let colorIdx = 0;
 
-            // Helper separator for IDs
-            const sep = "^^";
-
-            Object.keys(tree).forEach(m => {{
-                let mCount = 0;
-                
-                const mColor = palette[colorIdx % palette.length];
-                colorIdx++;
-
-                Object.keys(tree[m]).forEach(t => {{
-                    let tCount = 0;
-                    
-                    const tColor = palette[colorIdx % palette.length];
-                    colorIdx++;
-
-                    Object.keys(tree[m][t]).forEach(e => {{
-                        const eCount = tree[m][t][e];
-                        tCount += eCount;
-                        
-                        // Add Error Node (Leaf)
-                        const eId = `${{m}}${{sep}}${{t}}${{sep}}${{e}}`;
-                        ids.push(eId);
-                        labels.push(e); 
-                        parents.push(`${{m}}${{sep}}${{t}}`);
-                        values.push(eCount);
-                        colors.push(tColor);
-                    }});
-                    mCount += tCount;
-                    
-                    // Add Test Item Node
-                    const tId = `${{m}}${{sep}}${{t}}`;
-                    ids.push(tId);
-                    labels.push(t);
-                    parents.push(m);
-                    values.push(tCount);
-                    colors.push(tColor);
+            // Lazy drill-down: levels 1-3 are model, test item, error. Only
+            // LOD.sunburstDepth levels below the clicked model / test item / error
+            // are emitted; clicking a deeper node filters to it and shows the next ones.
+            let focusLevel = 0;
+            if (selectedClickFilters.model) {{
+                focusLevel = 1;
+                if (selectedClickFilters.testItem) focusLevel = selectedClickFilters.error ? 3 : 2;
+            }}
+            const maxLevel = focusLevel + LOD.sunburstDepth;
+
+            // Children are emitted before their parent, largest LOD.sunburstTopN in
+            // first-appearance order, the rest summed into one "Other" node
+            function addNodes(children, parentId, level, parentColor) {{
+                const entries = Array.from(children, ([label, node]) => [label, node.count]);
+                const kept = new Set(topK(entries, LOD.sunburstTopN).map(e => e[0]));
+                let otherCount = 0;
+                children.forEach((node, label) => {{
+                    if (!kept.has(label)) {{
+                        otherCount += node.count;
+                        return;
+                    }}
+                    const id = level === 1 ? label : `${{parentId}}${{sep}}${{label}}`;
+                    // Models and test items get their own color, errors their test item's
+                    let color = parentColor;
+                    if (level < 3) {{
+                        color = palette[colorIdx % palette.length];
+                        colorIdx++;
+                    }}
+                    if (level < maxLevel) addNodes(node.children, id, level + 1, color);
+                    ids.push(id);
+                    labels.push(label);
+                    parents.push(level === 1 ? "Total" : parentId);
+                    values.push(node.count);
+                    colors.push(color);
                 }});
-                
-                // Add Model Node
-                ids.push(m);
-                labels.push(m);
-                parents.push("Total");
-                values.push(mCount);
-                colors.push(mColor);
-            }});
+                if (kept.size < children.size) {{
+                    ids.push(level === 1 ? OTHER : `${{parentId}}${{sep}}${{OTHER}}`);
+                    labels.push(`Other (${{children.size - kept.size}} more)`);
+                    parents.push(level === 1 ? "Total" : parentId);
+                    values.push(otherCount);
+                    colors.push(level === 1 ? '#cccccc' : parentColor);
+                }}
+            }}
+            addNodes(tree, "Total", 1, null);
 
-            Plotly.newPlot('resultGraph', [{{
+            drawChart('resultGraph', [{{
                 ids: ids,
                 labels: labels,
                 parents: parents,
@@ -1030,8 +1720,11 @@ html_content = f"""
 
             // Listener removed from here
             
-            // Attach listeners safely
-            attachListeners();
+            // Attach listeners once the chart divs exist
+            if (!listenersAttached) {{
+                attachListeners();
+                listenersAttached = true;
+            }}
         }}
 
         function updateFilterDisplay() {{
@@ -1096,46 +1789,239 @@ html_content = f"""
         
         window.onclick = function(e) {{ if(e.target == document.getElementById('chartModal')) closeModal(); }};
 
-        function downloadRawData() {{
-            const data = currentFilteredData;
-            if(!data || data.length === 0) return alert("No data to download");
-            
-            const headers = Object.keys(data[0]);
-            const csvRows = [headers.join(",")];
-            
-            data.forEach(row => {{
-                const values = headers.map(header => {{
-                    let val = row[header] === null || row[header] === undefined ? "" : "" + row[header];
-                    val = val.replace(/\\"/g, '""');
-                    if (val.search(/("|,|\\n)/g) >= 0) val = `"${{val}}"`;
-                    return val;
-                }});
-                csvRows.push(values.join(","));
+        // Full rows passing currentFilters, matched through the cube's value -> code maps
+        function* filteredRows(table) {{
+            const positions = DIMENSIONS.map(d => table.columns.indexOf(d));
+            const masks = DIMENSIONS.map(d => currentFilters[d]);
+            const index = DIMENSIONS.map(d => dataset.index[d]);
+            rows: for (const row of table.rows) {{
+                for (let j = 0; j < DIMENSIONS.length; j++) {{
+                    const v = positions[j] < 0 || row[positions[j]] == null ? "" : row[positions[j]];
+                    const c = index[j].get(v);
+                    if (c === undefined || !masks[j][c]) continue rows;
+                }}
+                yield row;
+            }}
+        }}
+
+        // Quoted only when needed; quotes inside are doubled
+        const CSV_SPECIAL = /[",\\n]/;
+        const CSV_QUOTES = /"/g;
+        function csvCell(cell) {{
+            if (cell === null || cell === undefined) return "";
+            const val = typeof cell === "string" ? cell : "" + cell;
+            if (!CSV_SPECIAL.test(val)) return val;
+            return '"' + val.replace(CSV_QUOTES, '""') + '"';
+        }}
+
+        // The export as CSV text in pieces of rowsPerPart rows, so no single huge string is built
+        function* csvParts(table, rowsPerPart = 5000) {{
+            yield table.columns.join(",");
+            let lines = [];
+            for (const row of filteredRows(table)) {{
+                lines.push(row.map(csvCell).join(","));
+                if (lines.length === rowsPerPart) {{
+                    yield "\\n" + lines.join("\\n");
+                    lines = [];
+                }}
+            }}
+            if (lines.length) yield "\\n" + lines.join("\\n");
+        }}
+
+        // gzip while the CSV is generated, without holding the uncompressed text
+        function gzipParts(parts) {{
+            const encoder = new TextEncoder();
+            const source = new ReadableStream({{
+                pull(controller) {{
+                    const next = parts.next();
+                    if (next.done) controller.close();
+                    else controller.enqueue(encoder.encode(next.value));
+                }}
             }});
+            return new Response(source.pipeThrough(new CompressionStream('gzip'))).blob();
+        }}
+
+        async function downloadRawData() {{
+            if(!currentFilters || currentCount === 0) return alert("No data to download");
             
-            const blob = new Blob([csvRows.join("\\n")], {{ type: 'text/csv;charset=utf-8;' }});
+            const table = await getRawTable();
+            const compress = document.getElementById('gzipExport').checked && typeof CompressionStream !== 'undefined';
+            const blob = compress
+                ? new Blob([await gzipParts(csvParts(table))], {{ type: 'application/gzip' }})
+                : new Blob(Array.from(csvParts(table)), {{ type: 'text/csv;charset=utf-8;' }});
             const link = document.createElement("a");
             link.href = URL.createObjectURL(blob);
-            link.download = `raw_data_export.csv`;
+            link.download = compress ? `raw_data_export.csv.gz` : `raw_data_export.csv`;
             link.style.display = "none";
             document.body.appendChild(link);
             link.click();
             document.body.removeChild(link);
+            setTimeout(() => URL.revokeObjectURL(link.href), 0);
         }}
 
-        window.addEventListener('DOMContentLoaded', () => {{
+        // Called right after the cubeData block, so the charts are drawn before
+        // the browser has even read the full rows that follow it
+        async function initDashboard() {{
             populateDropdowns();
+            try {{
+                dataset = hydrateColumns(await readPayload('cubeData'));
+            }} catch (err) {{
+                document.getElementById('stats').innerHTML = `<div>Could not load the dashboard data: ${{err.message}}</div>`;
+                return;
+            }}
             updateDashboard();
-        }});
+        }}
     </script>
+
+    <!-- Data (see readPayload): chart/filter columns, read on load -->
+    {cube_block}
+    <script>initDashboard();</script>
+    <!-- Full rows for "Download Raw Data"; not executed, read on first download -->
+    {raw_block}
 </body>
 </html>
 """
 
-# Write to file
-try:
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        f.write(html_content)
-    print(f"Dashboard successfully created at: {OUTPUT_FILE}")
-except Exception as e:
-    print(f"Error writing HTML file: {e}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build the error analysis dashboard page from ticket exports.")
+    parser.add_argument("inputs", nargs="*", default=[FILE_PATH], metavar="EXPORT",
+                        help="ticket export CSVs or quoted glob patterns such as 'exports/tickets_*.csv'; "
+                             "tickets in several exports are taken from the newest by file name "
+                             "(default: FILE_PATH)")
+    parser.add_argument("-o", "--output", default=OUTPUT_FILE,
+                        help="HTML file to write (default: %(default)s)")
+    parser.add_argument("-j", "--jobs", type=int, default=JOBS,
+                        help="processes preparing exports in parallel (default: one per CPU; "
+                             "with STREAMING, exports are merged a chunk at a time by one process)")
+    parser.add_argument("-w", "--normalize-workers", type=int, default=NORMALIZE_WORKERS,
+                        help="processes normalizing the error messages of a single export "
+                             "(default: %(default)s; 0 for one per CPU)")
+    parser.add_argument("--compact", action="store_true",
+                        help="with USE_TICKET_STORE, rewrite every partition of the ticket store "
+                             "without superseded versions (default: only those where they pass "
+                             "COMPACT_THRESHOLD)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if PAYLOAD_COMPRESSION not in (None, "embedded", "sidecar"):
+        print(f"Unknown PAYLOAD_COMPRESSION: {PAYLOAD_COMPRESSION!r}")
+        exit(1)
+    input_files = expand_inputs(args.inputs)
+    if not input_files:
+        print(f"No ticket exports match: {' '.join(args.inputs)}")
+        exit(1)
+
+    # Load Data
+    print(f"Loading data from {len(input_files)} export(s)...")
+    # Preprocessing
+    # Full rows are serialized into temporary files as they are processed, and
+    # only the count cube and the small aggregates below are kept in memory.
+    print("Processing data...")
+    unique_models = set()
+    unique_results = set()
+    min_time = None
+    max_time = None
+    row_count = 0
+    cube = CountCube(CUBE_DIMENSIONS)
+    raw_table = RawTable(cube.encoders)
+    try:
+        # One pool of normalization processes serves every export and chunk
+        with normalization_pool(args.normalize_workers) as pool, \
+                NormalizationCache(os.path.join(CACHE_DIR, "normalization.sqlite")) as cache:
+            for chunk in prepared_chunks(input_files, cache, args.jobs, pool, args.compact):
+                # Unique values for dropdowns and the date range
+                if 'model' in chunk.columns:
+                    unique_models.update(distinct_values(chunk['model']))
+                if 'result' in chunk.columns:
+                    unique_results.update(distinct_values(chunk['result']))
+                valid_dates = chunk['fail_time'].dropna()
+                if not valid_dates.empty:
+                    lo, hi = valid_dates.min(), valid_dates.max()
+                    min_time = lo if min_time is None else min(min_time, lo)
+                    max_time = hi if max_time is None else max(max_time, hi)
+                if chunk.empty:
+                    continue
+
+                # We need ALL columns for the "Full Download" requirement
+                raw_table.add(chunk)
+                if TIME_DIMENSION == "fail_hour":
+                    # Only in the cube, not in the exported rows
+                    chunk["fail_hour"] = chunk["fail_time"].dt.strftime("%Y-%m-%d %H").fillna("")
+                cube.add(chunk)
+                row_count += len(chunk)
+    except Exception as e:
+        print(f"Error loading CSV: {e}")
+        exit(1)
+
+    min_date = min_time.strftime('%Y-%m-%d') if min_time is not None else ""
+    max_date = max_time.strftime('%Y-%m-%d') if max_time is not None else ""
+    drop_unused_hours(cube, min_time, max_time)
+    print(f"Processed {row_count} rows ({len(cube)} distinct chart cells).")
+    unique_models = sorted(unique_models)
+    unique_results = sorted(unique_results)
+    sidecar_base = os.path.splitext(args.output)[0]
+    cube_sidecar = sidecar_base + ".charts.json.gz"
+    raw_sidecar = sidecar_base + ".rows.json.gz"
+    cube_block = data_block("cubeData", CUBE_DATA_PLACEHOLDER, cube_sidecar)
+    raw_block = data_block("rawTable", RAW_DATA_PLACEHOLDER, raw_sidecar)
+
+    # --- HTML Generation ---
+    print("Generating HTML...")
+
+    js_models = json.dumps(unique_models)
+    js_results = json.dumps(unique_results)
+    js_dimensions = json.dumps(DIMENSIONS)
+    js_time_dimension = json.dumps(TIME_DIMENSION)
+    js_hourly_max_days = json.dumps(HOURLY_MAX_DAYS)
+    hour_option = '<option value="hour">Hour</option>' if TIME_DIMENSION == "fail_hour" else ""
+    js_papaparse_url = json.dumps(PAPAPARSE_URL)
+    js_lod = json.dumps({
+        "chartTopN": CHART_TOP_N,
+        "sunburstTopN": SUNBURST_TOP_N,
+        "sunburstDepth": SUNBURST_DEPTH,
+    })
+    # Same rule table as standardize_error, compiled in the browser for uploads
+    js_rules = json.dumps(rules_payload())
+
+    html_content = PAGE_TEMPLATE.format(
+        JS_NORMALIZER=JS_NORMALIZER,
+        PAPAPARSE_URL=PAPAPARSE_URL,
+        cube_block=cube_block,
+        hour_option=hour_option,
+        hourly_max_days=js_hourly_max_days,
+        js_dimensions=js_dimensions,
+        js_lod=js_lod,
+        js_models=js_models,
+        js_papaparse_url=js_papaparse_url,
+        js_results=js_results,
+        js_rules=js_rules,
+        js_time_dimension=js_time_dimension,
+        max_date=max_date,
+        min_date=min_date,
+        raw_block=raw_block,
+    )
+
+    # Write to file, streaming the row data in between the template pieces
+    html_head, html_rest = html_content.split(CUBE_DATA_PLACEHOLDER, 1)
+    html_middle, html_tail = html_rest.split(RAW_DATA_PLACEHOLDER, 1)
+    try:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(html_head)
+            write_data_block(f, lambda out: write_cube_payload(out, cube), cube_sidecar)
+            f.write(html_middle)
+            write_data_block(f, raw_table.write_payload, raw_sidecar)
+            f.write(html_tail)
+        print(f"Dashboard successfully created at: {args.output}")
+        if PAYLOAD_COMPRESSION == "sidecar":
+            print(f"Data written to {cube_sidecar} and {raw_sidecar} (keep them next to the page).")
+    except Exception as e:
+        print(f"Error writing HTML file: {e}")
+    finally:
+        raw_table.close()
+
+
+if __name__ == "__main__":
+    main()
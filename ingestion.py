@@ -0,0 +1,252 @@
+import codecs
+import hashlib
+import json
+import os
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from error_rules import RULESET_VERSION
+from normalization import NormalizationCache, normalize_errors
+
+# fail_time as written by the ticket export: 2026-01-09 05:15:07
+FAIL_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Explicit dtypes for the ticket export, so pandas skips type inference and
+# every chunk of a streamed read comes back with the same types. Everything is
+# read as text: ids like "mo" or "upn" must not turn into floats, and the
+# duration columns are only displayed/exported. fail_time is parsed separately
+# with FAIL_TIME_FORMAT.
+TICKET_DTYPES = {
+    col: str for col in [
+        "id", "status", "result", "mo", "model", "upn", "usn", "location",
+        "customer", "stage", "fail_id", "test_item", "symptom_code",
+        "reason_type", "reason_category", "reason_description",
+        "failure_symptom", "error_message", "error_message_nor", "log_link",
+        "fail_time", "analysis_start", "diagnosis_end", "repair_end",
+        "WTA", "TTA", "WTD", "TTD", "TTR", "TTC", "WAIT_MAT",
+        "analyses", "actions",
+    ]
+}
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# Low-cardinality dimensions stored as pandas categoricals in the prepared frame
+CATEGORY_COLUMNS = [
+    "model", "stage", "result", "status", "customer", "test_item",
+    "Analyzed_Error", "date_str",
+]
+
+
+def detect_encoding(path, block_size=1 << 20):
+    """Return 'utf-8' if the whole file decodes as UTF-8, else 'latin1'.
+
+    Only decodes bytes, which is far cheaper than a failed CSV parse followed
+    by a second full parse with another encoding.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        with open(path, "rb") as f:
+            while True:
+                block = f.read(block_size)
+                if not block:
+                    decoder.decode(b"", final=True)
+                    return "utf-8"
+                decoder.decode(block)
+    except UnicodeDecodeError:
+        return "latin1"
+
+
+def _dtypes_for(usecols):
+    if usecols is None:
+        return TICKET_DTYPES
+    return {c: t for c, t in TICKET_DTYPES.items() if c in usecols}
+
+
+def _pyarrow_csv_options(usecols, encoding, block_size=None):
+    """(pyarrow.csv module, its options for reading a ticket export)."""
+    try:
+        import pyarrow as pa
+        from pyarrow import csv as pa_csv
+    except ImportError:
+        raise ImportError("engine='pyarrow' requires the pyarrow package") from None
+
+    read_options = pa_csv.ReadOptions(encoding=encoding)
+    if block_size is not None:
+        read_options.block_size = block_size
+    return pa_csv, dict(
+        read_options=read_options,
+        # error_message holds quoted multi-line logs
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=list(usecols) if usecols is not None else None,
+            column_types={c: pa.string() for c in _dtypes_for(usecols)},
+            strings_can_be_null=True,
+        ),
+    )
+
+
+def read_tickets(path, usecols=None, engine="c", encoding=None):
+    """Read a whole ticket export with the typed schema.
+
+    engine="pyarrow" reads through pyarrow.csv, as pandas' own pyarrow
+    engine cannot parse values with line breaks; it needs pyarrow installed.
+    """
+    encoding = encoding or detect_encoding(path)
+    if engine != "pyarrow":
+        return pd.read_csv(path, usecols=usecols, dtype=_dtypes_for(usecols),
+                           encoding=encoding, engine=engine)
+
+    pa_csv, options = _pyarrow_csv_options(usecols, encoding)
+    return pa_csv.read_csv(path, **options).to_pandas()
+
+
+def iter_ticket_chunks(path, chunksize=DEFAULT_CHUNKSIZE, usecols=None, engine="c", encoding=None):
+    """Yield a ticket export as DataFrames of at most ``chunksize`` rows.
+
+    engine="pyarrow" streams record batches through pyarrow.csv (pandas'
+    own pyarrow engine cannot read in chunks); it needs pyarrow installed.
+    """
+    encoding = encoding or detect_encoding(path)
+    if engine != "pyarrow":
+        yield from pd.read_csv(path, usecols=usecols, dtype=_dtypes_for(usecols),
+                               encoding=encoding, engine=engine, chunksize=chunksize)
+        return
+
+    # Roughly 1 KB per ticket row
+    pa_csv, options = _pyarrow_csv_options(usecols, encoding, block_size=max(chunksize * 1024, 1 << 20))
+    for batch in pa_csv.open_csv(path, **options):
+        yield batch.to_pandas()
+
+
+def parse_fail_time(values):
+    """Parse fail_time with the known export format.
+
+    Values in any other format fall back to pandas' inference, so nothing that
+    parsed before turns into NaT.
+    """
+    parsed = pd.to_datetime(values, format=FAIL_TIME_FORMAT, errors="coerce")
+    retry = parsed.isna() & values.notna()
+    if retry.any():
+        parsed[retry] = pd.to_datetime(values[retry], errors="coerce")
+    return parsed
+
+
+def prepare_tickets(df, cache=None, pool=None):
+    """Add the derived columns the dashboards work with.
+
+    fail_time is parsed, Analyzed_Error holds the standardized error and
+    date_str the YYYY-MM-DD day of the failure ("" if unknown). The processes
+    of ``pool`` normalize the messages (see normalization.clean_messages).
+    """
+    df['fail_time'] = parse_fail_time(df['fail_time'])
+
+    # Error Column Logic
+    # User requested strict usage of 'error_message_nor'
+    if 'error_message_nor' in df.columns:
+        df['Analyzed_Error'] = df['error_message_nor'].fillna("Unknown")
+    else:
+        df['Analyzed_Error'] = df['error_message']
+
+    # Remove the log prefix and standardize patterns (see error_rules.RULES / MASKS).
+    # Only distinct messages are normalized; ``cache`` remembers them across runs.
+    df['Analyzed_Error'] = normalize_errors(df['Analyzed_Error'], cache, pool)
+
+    df['date_str'] = df['fail_time'].dt.strftime('%Y-%m-%d').fillna("")
+    return df
+
+
+def categorize(df):
+    """Turn the CATEGORY_COLUMNS present in ``df`` into categoricals."""
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def append_categorized(frame, delta):
+    """``frame`` (categorized) followed by the prepared rows of ``delta``.
+
+    Only ``delta`` is categorized; the CATEGORY_COLUMNS of both are joined by
+    unioning their categories, so the rows of ``frame`` are recoded rather
+    than hashed again. Categories stay sorted, as categorize() makes them.
+    """
+    delta = categorize(delta)
+    if frame.empty:
+        return delta.reset_index(drop=True)
+    out = pd.concat([frame, delta], ignore_index=True)
+    for col in CATEGORY_COLUMNS:
+        if col in frame.columns and col in delta.columns:
+            out[col] = union_categoricals([frame[col], delta[col]], sort_categories=True)
+    return out
+
+
+def file_sha1(path, block_size=1 << 20):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _frame_cache_paths(path, cache_dir):
+    name = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+    base = os.path.join(cache_dir, "frames", name)
+    return base + ".parquet", base + ".json"
+
+
+def load_prepared_tickets(path, cache_dir, engine="c", cache=None, pool=None):
+    """Read and prepare a ticket export, going through a Parquet cache of the result.
+
+    The prepared frame (categorical dimensions, Analyzed_Error, date_str) is
+    stored under ``cache_dir`` and reused while the source file and
+    RULESET_VERSION are unchanged. Size + mtime are checked first; if only the
+    mtime moved, the content hash decides. Without a Parquet engine
+    (pyarrow) the export is simply prepared every time.
+    """
+    data_path, meta_path = _frame_cache_paths(path, cache_dir)
+    st = os.stat(path)
+    meta = None
+    if os.path.exists(data_path) and os.path.exists(meta_path):
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("ruleset") != RULESET_VERSION or meta.get("size") != st.st_size:
+            meta = None
+        elif meta.get("mtime_ns") != st.st_mtime_ns:
+            if meta.get("sha1") != file_sha1(path):
+                meta = None
+            else:
+                meta["mtime_ns"] = st.st_mtime_ns
+                with open(meta_path, "w", encoding="utf-8") as f:
+                    json.dump(meta, f)
+    if meta is not None:
+        try:
+            return pd.read_parquet(data_path)
+        except ImportError:
+            pass
+
+    df = categorize(prepare_tickets(read_tickets(path, engine=engine), cache, pool))
+    try:
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        df.to_parquet(data_path + ".tmp", index=False)
+    except ImportError:
+        return df
+    os.replace(data_path + ".tmp", data_path)
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "source": os.path.abspath(path),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha1": file_sha1(path),
+            "ruleset": RULESET_VERSION,
+        }, f)
+    return df
+
+
+def load_export(path, cache_dir, engine="c"):
+    """load_prepared_tickets() with the normalization cache under ``cache_dir``.
+
+    Opens everything it needs itself, so it can run in a worker process.
+    """
+    with NormalizationCache(os.path.join(cache_dir, "normalization.sqlite")) as cache:
+        return load_prepared_tickets(path, cache_dir, engine=engine, cache=cache)
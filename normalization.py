@@ -0,0 +1,146 @@
+import contextlib
+import hashlib
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from error_rules import RULESET_VERSION, clean_error
+
+# Fewer messages than this are normalized in-process: starting the workers
+# would cost more than it saves
+PARALLEL_THRESHOLD = 20_000
+
+
+def message_key(message):
+    """Stable hash of a raw error message, used as the cache key."""
+    return hashlib.blake2b(message.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+class NormalizationCache:
+    """On-disk store of normalized messages, keyed by message hash + rule-set version.
+
+    Backed by a single SQLite file so reruns and overlapping ticket exports
+    only normalize messages they have not seen under the current rules.
+    """
+
+    # SQLite caps the number of host parameters per statement
+    BATCH = 500
+    # Seconds to wait for another process writing to the same file
+    TIMEOUT = 30
+
+    def __init__(self, path, version=RULESET_VERSION):
+        self.path = path
+        self.version = version
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=self.TIMEOUT)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS normalized ("
+            " version TEXT NOT NULL,"
+            " msg_hash TEXT NOT NULL,"
+            " result TEXT NOT NULL,"
+            " PRIMARY KEY (version, msg_hash))"
+        )
+
+    def get_many(self, keys):
+        """Return {key: result} for the keys already cached."""
+        found = {}
+        keys = list(keys)
+        for i in range(0, len(keys), self.BATCH):
+            batch = keys[i:i + self.BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._conn.execute(
+                f"SELECT msg_hash, result FROM normalized"
+                f" WHERE version = ? AND msg_hash IN ({placeholders})",
+                [self.version, *batch],
+            )
+            found.update(rows)
+        return found
+
+    def put_many(self, items):
+        """Store (key, result) pairs."""
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO normalized (version, msg_hash, result) VALUES (?, ?, ?)",
+                ((self.version, k, r) for k, r in items),
+            )
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _clean_batch(messages):
+    return [clean_error(m) for m in messages]
+
+
+def normalization_pool(workers=1):
+    """The process pool clean_messages() shares across calls, as a context manager.
+
+    ``workers`` processes (None or 0: one per CPU). With a single worker it
+    yields None and messages are normalized in-process. Create it once per
+    run: the processes are started on first use and reused by every export
+    or chunk normalized within the ``with`` block.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        return contextlib.nullcontext()
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def clean_messages(messages, pool=None):
+    """clean_error() of each message, in order, by the processes of ``pool``.
+
+    ``pool`` comes from normalization_pool(); without one, or below
+    PARALLEL_THRESHOLD messages, it runs in-process. Only the strings travel
+    to the workers, as contiguous batches whose results are joined back in
+    batch order, so a message's position stays its code and the output is
+    exactly the serial one.
+    """
+    messages = list(messages)
+    if pool is None or len(messages) < PARALLEL_THRESHOLD:
+        return _clean_batch(messages)
+    # A few batches per CPU evens out messages of different cost
+    size = -(-len(messages) // ((os.cpu_count() or 1) * 4))
+    batches = [messages[i:i + size] for i in range(0, len(messages), size)]
+    return [r for batch in pool.map(_clean_batch, batches) for r in batch]
+
+
+def normalize_unique(messages, cache=None, pool=None):
+    """Normalize a sequence of distinct raw messages, consulting ``cache`` first."""
+    messages = list(messages)
+    if cache is None:
+        return clean_messages(messages, pool)
+
+    keys = [message_key(m) for m in messages]
+    cached = cache.get_many(keys)
+    missing = [i for i, k in enumerate(keys) if k not in cached]
+    cleaned = clean_messages([messages[i] for i in missing], pool)
+    if cleaned:
+        cache.put_many((keys[i], r) for i, r in zip(missing, cleaned))
+    results = [cached.get(k) for k in keys]
+    for i, r in zip(missing, cleaned):
+        results[i] = r
+    return results
+
+
+def normalize_errors(series, cache=None, pool=None):
+    """Strip log prefixes and standardize a column of raw error messages.
+
+    The column is factorized first, so each distinct message is normalized
+    once (by the processes of ``pool``, see clean_messages) and the results are
+    mapped back through the integer codes.
+    """
+    series = series.astype(str)
+    codes, uniques = pd.factorize(series)
+    normalized = np.asarray(normalize_unique(uniques, cache, pool), dtype=object)
+    return pd.Series(normalized[codes], index=series.index, name=series.name)
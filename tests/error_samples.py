@@ -0,0 +1,32 @@
+"""Error messages for checking and benchmarking the normalizers."""
+
+# Representative messages for every rule plus a few fallback cases.
+SAMPLE_MESSAGES = [
+    "2026-01-08 22:15:06 | ERROR | 'Last login: Fri Jan  9 09:24:01 2026 from 172.17.6.32start serial session -i 35 -b 1\n\n\nip addr\nWcsCli# start serial session -i 35 -b 1\n' does not appear to be an IPv4 or IPv6 address",
+    "U12 create account - fail ",
+    "HTTPConnectionPool(host='172.17.6.32', port=5985): Max retries exceeded with url: /wsman (Caused by ConnectTimeoutError(<urllib3.connection.HTTPConnection object at 0x7f3a2b1c4d90>, 'Connection to 172.17.6.32 timed out. (connect timeout=30)'))",
+    "check BMC FW Version, expected equal to C2195.BC.0406, actual: C2195.BC.0405 - Fail\nFailed to ping 172.17.6.40, DUT is not reachable.",
+    "Command [show manager relay -p 3] timeout.",
+    "check DIMM Locator, expected equal to DIMM_A1, actual: DIMM_B1 - Fail",
+    "Invalid SFCS stage, expected: TN, actual: N2",
+    "check sensor Fan_3 reading, expected equal to ok, actual: ns - Fail",
+    "This BDF 0000:3b:00.0 didn't have device exist in OS\n",
+    "check System SN, expected equal to P123960240113012, actual: P123960240113099 - Fail",
+    "check psu1pwr-511-ac-red, expected equal to OK, actual: NOT - Fail\nTOR switch M1171500-001 (DATA_SW, U41) - Fail",
+    "Failed to process the command: ping -c 4 -i 1 -W 10 172.17.6.32",
+    "2026-01-08 22:15:06 | ERROR | check BMC FW Version, expected equal to C2195.BC.0406, actual: C2195.BC.0405 - Fail\n2026-01-08 22:15:06 | ERROR | Command [set system bmc update -i 12 -f C2195.BC.0406.00.bin] timeout.",
+    "Failed to 'GetUSNGenealogyBasic' with {'UnitSerialNumber': 'P123960240113012', 'StageCode': 'TN'}",
+    "Failed to execute RM cmd: 'set system psu update -i 2 -f PSU_FW.hex -t 1'",
+    "<pypsrp.powershell.PSDataStreams object at 0x7070d4703490>\nrc=True, Failed to execute cmd 'cd ~\\.\\inband_tools\\MPF_latest; .\\s ;'",
+    "Get tpm ekcert from sfcs error, error message: ['NoneType' object has no attribute 'get']",
+    "Failed to execute RM cmd: 'set system cmd -i 7 -c raw 0x34 0x93 0x01 0x04', 'Completion Code: Failure', 'Status Description: Failed to run command ['raw', '0x34', '0x93', '0x01', '0x04'] with error: Unable to send RAW command (channel=0x0 netfn=0x34 lun=0x0 cmd=0x93 rsp=0xd5): Command not supported in present state'",
+    "Failed to ping 172.17.6.32 at Fri Jan  9 09:24:01 2026",
+    "fail_id BAAB6ABD-92A9-4E71-830A-081A3AF879B5 not found for P123960240113012",
+    "<urllib3.connection.HTTPConnection object at 0x7f3a2b1c4d90> refused",
+    "NVMe 0000:3b:00.0 link down, expected BIOS C2195.BC.0406.00 and CPLD v2.14.1",
+    "set system cmd -i 172.17.6.32 failed",
+    "start serial session -i 35 -b 1 failed",
+    "check PSU Vendor, expected equal to Flex, actual: Flexn - Fail",
+    "Unknown",
+    "",
+]
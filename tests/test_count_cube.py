@@ -0,0 +1,34 @@
+"""CountCube rolls an hourly cube up into the daily one."""
+import pandas as pd
+
+from generate_dashboard import CountCube, drop_unused_hours
+
+
+def hourly(times):
+    fail_time = pd.to_datetime(pd.Series(times))
+    return pd.DataFrame({
+        "date_str": fail_time.dt.strftime("%Y-%m-%d").fillna(""),
+        "model": ["A", "B", "A", "A", "B"][:len(times)],
+        "fail_hour": fail_time.dt.strftime("%Y-%m-%d %H").fillna(""),
+    })
+
+
+def test_drop_matches_the_cube_counted_without_the_column():
+    df = hourly(["2026-01-08 22:15:06", "2026-01-08 23:00:00", "2026-01-08 23:59:00", None, "2026-01-09 01:00:00"])
+    cube = CountCube(["date_str", "model", "fail_hour"])
+    daily = CountCube(["date_str", "model"])
+    for chunk in (df.iloc[:2], df.iloc[2:]):
+        cube.add(chunk)
+        daily.add(chunk)
+    cube.drop("fail_hour")
+    assert cube.payload() == daily.payload()
+
+
+def test_hours_are_kept_only_for_short_spans():
+    # Three days at most (HOURLY_MAX_DAYS), counted by calendar day
+    for last, dims in (("2026-01-09 23:00:00", ["date_str", "model", "fail_hour"]),
+                       ("2026-01-10 00:00:00", ["date_str", "model"])):
+        cube = CountCube(["date_str", "model", "fail_hour"])
+        cube.add(hourly(["2026-01-07 00:00:00", last]))
+        drop_unused_hours(cube, pd.Timestamp("2026-01-07 00:00:00"), pd.Timestamp(last))
+        assert cube.dims == dims
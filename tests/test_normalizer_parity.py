@@ -0,0 +1,88 @@
+"""The Python normalizer and the browser one (JS_NORMALIZER) give the same results.
+
+The JavaScript side runs under Node.js; those tests are skipped without it.
+"""
+import json
+import random
+import shutil
+import subprocess
+
+import pytest
+
+from error_rules import JS_NORMALIZER, clean_error, rules_payload, standardize_error
+from tests.error_samples import SAMPLE_MESSAGES
+
+_PARITY_SCRIPT = """
+const input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const engine = compileErrorRules(input.spec);
+process.stdout.write(JSON.stringify(input.messages.map(m => engine.clean(m))));
+"""
+
+# Characters the two regex flavours and strip()/trim() disagree on
+UNICODE_DIGITS = [chr(0x660 + i) for i in range(10)] + [chr(0x966 + i) for i in range(10)] + [chr(0xFF10 + i) for i in range(10)]
+UNICODE_SPACES = ["\x1c", "\x1d", "\x1e", "\x1f", "\x85", "\xa0", "\u2028", "\u3000", "\ufeff"]
+ASCII_SPACES = [" ", "\t", "\n", "\r", "\x0b", "\x0c"]
+
+
+@pytest.fixture(scope="module")
+def js_clean():
+    node = shutil.which("node")
+    if node is None:
+        pytest.skip("Node.js is needed to run the browser normalizer")
+
+    def clean(messages):
+        proc = subprocess.run(
+            [node, "-e", JS_NORMALIZER + _PARITY_SCRIPT],
+            input=json.dumps({"spec": rules_payload(), "messages": messages}),
+            capture_output=True, text=True, encoding="utf-8", check=True,
+        )
+        return json.loads(proc.stdout)
+    return clean
+
+
+def fuzzed(messages, count, seed=0):
+    """Variants of ``messages`` with Unicode digits and odd whitespace mixed in."""
+    rng = random.Random(seed)
+    spaces = UNICODE_SPACES + ASCII_SPACES
+    variants = []
+    for _ in range(count):
+        chars = list(rng.choice(messages))
+        for i, c in enumerate(chars):
+            if c.isdigit() and rng.random() < 0.3:
+                chars[i] = rng.choice(UNICODE_DIGITS)
+            elif c == " " and rng.random() < 0.1:
+                chars[i] = rng.choice(spaces)
+        head = "".join(rng.choice(spaces) for _ in range(rng.randint(0, 2)))
+        tail = "".join(rng.choice(spaces) for _ in range(rng.randint(0, 3)))
+        variants.append(head + "".join(chars) + tail)
+    return variants
+
+
+def assert_same(messages, js_results):
+    mismatches = [
+        (m, py, js)
+        for m, py, js in zip(messages, (clean_error(m) for m in messages), js_results)
+        if py != js
+    ]
+    assert not mismatches, f"{len(mismatches)}/{len(messages)} differ, e.g. {mismatches[:3]!r}"
+
+
+def test_samples_match(js_clean):
+    assert_same(SAMPLE_MESSAGES, js_clean(SAMPLE_MESSAGES))
+
+
+def test_unicode_digits_and_whitespace_match(js_clean):
+    messages = fuzzed(SAMPLE_MESSAGES, 5000)
+    assert_same(messages, js_clean(messages))
+
+
+def test_only_ascii_digits_are_masked():
+    assert standardize_error("start serial session -i \u0663\u0665 -b 1 failed") == \
+        "start serial session -i \u0663\u0665 -b X failed"
+
+
+def test_suffix_rules_strip_ascii_whitespace_only():
+    assert standardize_error("U12 create account - fail \t\r\n") == "UXX create account - fail"
+    # str.strip() would remove the first, trim() the second
+    assert standardize_error("U12 create account - fail\x1c") == "U12 create account - fail\x1c"
+    assert standardize_error("U12 create account - fail\ufeff") == "U12 create account - fail\ufeff"
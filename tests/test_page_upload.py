@@ -0,0 +1,164 @@
+"""Uploading a CSV into the generated page fills its count cube.
+
+The page's scripts run under Node.js with a minimal DOM, a Worker that runs
+the worker's Blob source in its own context, and a stand-in for PapaParse
+(the page loads the real one from a CDN). Skipped without Node.js.
+"""
+import json
+import shutil
+import subprocess
+
+import pandas as pd
+import pytest
+
+import generate_dashboard
+
+_UPLOAD_SCRIPT = r"""
+const fs = require('fs');
+const vm = require('vm');
+const input = JSON.parse(fs.readFileSync(0, 'utf8'));
+
+const elements = {};
+const element = id => elements[id] || (elements[id] = {
+    id, style: {}, value: '', innerHTML: '', textContent: '', checked: false, attrs: {},
+    parentElement: {offsetWidth: 800},
+    appendChild() {}, removeChild() {}, addEventListener() {}, click() {}, on() {},
+    removeAllListeners() {}, classList: {add() {}, remove() {}, toggle() {}},
+    setAttribute(k, v) { this.attrs[k] = v; },
+    getAttribute(k) { return k in this.attrs ? this.attrs[k] : null; },
+});
+const listeners = {};
+global.window = global;
+global.addEventListener = (type, fn) => { listeners[type] = fn; };
+global.document = {
+    getElementById: element, createElement: () => element('_'), body: element('body'),
+    querySelector: () => element('_'), querySelectorAll: () => [],
+};
+global.Plotly = {newPlot: async () => {}, react: async () => {}, purge() {}, relayout: async () => {}, restyle: async () => {}};
+global.alert = message => { global.alerted = message; };
+
+// PapaParse, a few rows per chunk. Papa worker mode is how releases before
+// 5.3.1 behaved in any worker started from a blob: URL.
+function papa(workerMode, post) {
+    return {parse(file, config) {
+        let k = 0;
+        const step = () => {
+            const data = file.rows.slice(k, k += 3).map(row => Object.assign({}, row));
+            const finished = k >= file.rows.length;
+            const results = {data, meta: {cursor: Math.min(k, file.rows.length) * 100}};
+            if (workerMode) post({results, workerId: 1, finished});
+            else config.chunk(results);
+            if (finished) config.complete({data: []});
+            else setTimeout(step, 0);
+        };
+        setTimeout(step, 0);
+    }};
+}
+global.Papa = papa(false);
+
+const blobSources = {};
+global.Blob = class {
+    constructor(parts) { this.parts = parts; }
+};
+URL.createObjectURL = blob => {
+    const url = 'blob:' + Object.keys(blobSources).length;
+    blobSources[url] = blob.parts.join('');
+    return url;
+};
+if (input.mode !== 'page') {
+    global.Worker = class {
+        constructor(url) {
+            const context = vm.createContext({setTimeout, console});
+            context.self = context;
+            context.importScripts = () => {
+                context.Papa = papa(input.mode === 'papa-worker', msg => context.postMessage(msg));
+            };
+            context.postMessage = (msg, transfer) => {
+                if (this.terminated) return;
+                const copy = structuredClone(msg, {transfer});
+                setTimeout(() => this.onmessage({data: copy}), 0);
+            };
+            vm.runInContext(blobSources[url], context);
+            this.context = context;
+            global.workerStarted = true;
+        }
+        postMessage(msg) {
+            const copy = structuredClone(msg);
+            setTimeout(() => this.context.onmessage({data: copy}), 0);
+        }
+        terminate() { this.terminated = true; }
+    };
+}
+
+const html = fs.readFileSync(input.page, 'utf8');
+let code = '';
+for (const m of html.matchAll(/<script( [^>]*)?>([\s\S]*?)<\/script>/g)) {
+    const id = /id="([^"]+)"/.exec(m[1] || '');
+    if (id) element(id[1]).textContent = m[2];
+    else if (!/ src=/.test(m[1] || '')) code += m[2] + '\n';
+}
+for (const m of html.matchAll(/<input [^>]*id="(\w+)"[^>]*value="([^"]*)"/g)) element(m[1]).value = m[2];
+for (const m of html.matchAll(/<select id="(\w+)"[^>]*>\s*<option value="([^"]*)"/g)) element(m[1]).value = m[2];
+vm.runInThisContext(code);
+
+(async () => {
+    if (listeners.DOMContentLoaded) await listeners.DOMContentLoaded();
+    handleFileUpload({target: {files: [{rows: input.rows, size: input.rows.length * 100}]}});
+    const status = element('uploadStatus');
+    for (let i = 0; i < 500 && !/successfully/.test(status.textContent) && !global.alerted; i++) {
+        await new Promise(resolve => setTimeout(resolve, 5));
+    }
+    process.stdout.write(JSON.stringify({
+        status: status.textContent, alert: global.alerted || null, stats: element('stats').innerHTML,
+        worker: !!global.workerStarted,
+    }));
+})();
+"""
+
+TICKETS = pd.DataFrame({
+    "id": [f"T{i}" for i in range(10)],
+    "status": "New",
+    "result": ["Ineffective", "Fixed"] * 5,
+    "model": ["GEN-9", "GEN-9", "GEN-10", "GEN-10", "GEN-11"] * 2,
+    "stage": "TN",
+    "fail_id": [f"F{i}" for i in range(10)],
+    "test_item": ["TN_CHK_PSU_CONFIG_CHECK", "TN_CHK_FAN"] * 5,
+    "error_message_nor": ["2026-01-08 22:15:06 | ERROR | check PSU Model - Fail", "fan 3 speed 1200 rpm - fail"] * 5,
+    "fail_time": [f"2026-01-0{1 + i % 3} 0{i % 10}:15:06" for i in range(10)],
+})
+
+
+@pytest.fixture(scope="module")
+def upload(tmp_path_factory):
+    node = shutil.which("node")
+    if node is None:
+        pytest.skip("Node.js is needed to run the page's scripts")
+
+    tmp = tmp_path_factory.mktemp("page")
+    export, page = tmp / "tickets_20260108_221513.csv", tmp / "dashboard.html"
+    # The page starts out with a different, one-ticket export
+    TICKETS.head(1).to_csv(export, index=False)
+    cache_dir = generate_dashboard.CACHE_DIR
+    generate_dashboard.CACHE_DIR = str(tmp / "cache")
+    try:
+        generate_dashboard.main([str(export), "-o", str(page)])
+    finally:
+        generate_dashboard.CACHE_DIR = cache_dir
+
+    def run(mode):
+        proc = subprocess.run(
+            [node, "-e", _UPLOAD_SCRIPT],
+            input=json.dumps({"page": str(page), "mode": mode, "rows": TICKETS.to_dict("records")}),
+            capture_output=True, text=True, encoding="utf-8", check=True,
+        )
+        return json.loads(proc.stdout)
+    return run
+
+
+@pytest.mark.parametrize("mode", ["page", "worker", "papa-worker"])
+def test_upload_fills_the_cube(upload, mode):
+    result = upload(mode)
+    assert result["alert"] is None
+    assert result["worker"] == (mode != "page")
+    assert result["status"] == f"File loaded successfully! {len(TICKETS)} records processed."
+    assert result["stats"] == f"<div>Total Records: <strong>{len(TICKETS)}</strong></div>"
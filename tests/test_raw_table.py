@@ -0,0 +1,51 @@
+"""RawTable payloads decode back to the full rows."""
+import io
+import json
+
+import pandas as pd
+
+from generate_dashboard import CountCube, RawTable, raw_values
+
+
+def decode(payload, cube):
+    """The rows of a RawTable payload, as rawRows in the page rebuilds them."""
+    dicts = cube.payload()["dicts"]
+    columns = []
+    for col in payload["columns"]:
+        values = payload["data"].get(col)
+        if values is None:
+            values = [""] * payload["length"]
+        elif col in payload["codes"]:
+            values = [dicts[col][c] for c in values]
+        columns.append(values)
+    return [list(row) for row in zip(*columns)]
+
+
+def test_round_trip():
+    chunks = [
+        pd.DataFrame({
+            "id": ["T1", "T2"], "model": pd.Categorical(["GEN-9", None]), "WTA": [None, None],
+            "fail_time": pd.to_datetime(["2026-01-08 22:15:06", None]),
+            "error_message": ["a </script> b", None],
+        }),
+        pd.DataFrame({
+            "id": ["T3"], "model": pd.Categorical(["GEN-10"]), "WTA": [None],
+            "fail_time": pd.to_datetime(["2026-01-09 01:00:00"]), "error_message": ["c"],
+        }),
+    ]
+    cube = CountCube(["model"])
+    table = RawTable(cube.encoders)
+    for chunk in chunks:
+        cube.add(chunk)
+        table.add(chunk)
+    out = io.StringIO()
+    table.write_payload(out)
+    table.close()
+
+    assert "</script>" not in out.getvalue()
+    payload = json.loads(out.getvalue())
+    assert payload["codes"] == ["model"]
+    assert "WTA" not in payload["data"]
+    expected = pd.concat(chunks, ignore_index=True)
+    expected = pd.DataFrame({col: raw_values(expected[col]) for col in expected.columns})
+    assert decode(payload, cube) == expected.values.tolist()
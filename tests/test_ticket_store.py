@@ -0,0 +1,76 @@
+"""TicketStore and LiveTickets keep the newest snapshot of every ticket."""
+import os
+
+import pandas as pd
+import pytest
+
+from ticket_store import LiveTickets, TicketStore, export_snapshot
+
+pytest.importorskip("pyarrow")
+
+
+def write_export(directory, snapshot, results):
+    """tickets_<snapshot>.csv with one ticket per ``results`` entry."""
+    path = os.path.join(directory, f"tickets_{snapshot}.csv")
+    pd.DataFrame({
+        "id": [f"T{i}" for i in range(len(results))],
+        "result": results,
+        "fail_id": [f"F{i}" for i in range(len(results))],
+        "error_message": ["check PSU Model - Fail"] * len(results),
+        "fail_time": ["2026-01-08 22:15:06"] * len(results),
+    }).to_csv(path, index=False)
+    return path
+
+
+def results_by_id(df):
+    return dict(zip(df["id"], df["result"].astype(str)))
+
+
+def test_export_snapshot():
+    assert export_snapshot("exports/tickets_20260108_221513.csv") == "20260108_221513"
+    assert export_snapshot("exports/tickets.csv") is None
+
+
+def test_older_export_does_not_roll_tickets_back(tmp_path):
+    drop, store_dir = tmp_path / "drop", str(tmp_path / "store")
+    drop.mkdir()
+    old = write_export(drop, "20260107_000000", ["Open", "Open", "Open"])
+    write_export(drop, "20260108_000000", ["Open", "Fixed", "Open", "Open"])
+    live = LiveTickets(str(drop), store_dir)
+    live.refresh()
+
+    # The older export is synced again, and even edited
+    write_export(drop, "20260107_000000", ["Open", "Open", "Retest"])
+    os.utime(old, ns=(0, 0))
+    version, frame = live.refresh()
+    expected = {"T0": "Open", "T1": "Fixed", "T2": "Open", "T3": "Open"}
+    assert results_by_id(frame) == expected
+    with TicketStore(store_dir) as store:
+        assert results_by_id(store.load()) == expected
+
+
+def test_unchanged_tickets_move_to_the_newer_snapshot(tmp_path):
+    a = write_export(tmp_path, "20260107_000000", ["Open", "Open"])
+    b = write_export(tmp_path, "20260109_000000", ["Open", "Open"])
+    with TicketStore(str(tmp_path / "store")) as store:
+        store.ingest(pd.read_csv(a, dtype=str), snapshot=export_snapshot(a))
+        store.ingest(pd.read_csv(b, dtype=str), snapshot=export_snapshot(b))
+        # A late export from in between: T1 changed there, but the newer one agrees with the old
+        late = write_export(tmp_path, "20260108_000000", ["Open", "Fixed"])
+        assert store.ingest(pd.read_csv(late, dtype=str), snapshot=export_snapshot(late)) == (0, 0)
+        assert results_by_id(store.load()) == {"T0": "Open", "T1": "Open"}
+
+
+def test_compact_threshold(tmp_path):
+    old = write_export(tmp_path, "20260107_000000", ["Open"] * 4)
+    new = write_export(tmp_path, "20260108_000000", ["Fixed", "Open", "Open", "Open"])
+    with TicketStore(str(tmp_path / "store")) as store:
+        store.ingest(pd.read_csv(old, dtype=str), snapshot=export_snapshot(old))
+        seq = store.last_seq
+        store.ingest(pd.read_csv(new, dtype=str), snapshot=export_snapshot(new))
+        # One superseded version for four current tickets
+        assert store.compact(threshold=0.5) == 0
+        assert store.compact(threshold=0.2) == 1
+        assert store.last_seq == seq + 2
+        assert results_by_id(store.load()) == {"T0": "Fixed", "T1": "Open", "T2": "Open", "T3": "Open"}
+        assert list(store.changes_since(seq)["id"]) == ["T0"]
@@ -0,0 +1,268 @@
+import datetime
+import functools
+import glob
+import os
+
+import numpy as np
+import pandas as pd
+
+from ticket_store import TicketStore, live_parts
+
+# Both engines answer the same queries for the Streamlit app. A selection is
+# (models, stages, results, start_date, end_date); empty model/stage/result
+# tuples and missing dates do not filter.
+
+TOP_ERRORS = 10
+
+
+def value_mask(col, selected):
+    """Boolean mask of the rows of ``col`` whose value is one of ``selected``.
+
+    Categorical columns are matched once per category and looked up through
+    the integer codes; missing values (code -1) match if a NaN was selected.
+    """
+    if not isinstance(col.dtype, pd.CategoricalDtype):
+        return col.isin(selected).to_numpy()
+    wanted = np.append(col.cat.categories.isin(selected), any(pd.isna(v) for v in selected))
+    return wanted[col.cat.codes.to_numpy()]
+
+
+def search_mask(col, text):
+    """Rows of ``col`` containing ``text`` (case-insensitive); categoricals are searched per category."""
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        wanted = np.append(col.cat.categories.astype(str).str.contains(text, case=False, regex=False), False)
+        return wanted[col.cat.codes.to_numpy()]
+    return col.astype(str).str.contains(text, case=False, regex=False).to_numpy() & col.notna().to_numpy()
+
+
+def _daily(days):
+    """Date/Count frame from a date_str -> count series, in date order."""
+    errors_over_time = days.sort_index().rename_axis('Date').reset_index(name='Count')
+    errors_over_time['Date'] = pd.to_datetime(errors_over_time['Date'].astype(str)).dt.date
+    return errors_over_time
+
+
+class FrameQueries:
+    """Queries over tickets held in memory as one prepared, categorized DataFrame."""
+
+    def __init__(self, df):
+        self.df = df
+        self.columns = df.columns.tolist()
+        self.empty = df.empty
+        # Paging through the raw data reuses the filtered and sorted positions
+        self._rows = functools.lru_cache(maxsize=64)(self._matching_rows)
+        self._ordered = functools.lru_cache(maxsize=16)(self._ordered_rows)
+
+    def values(self, column):
+        """Distinct values of a column, in order of first appearance."""
+        return self.df[column].unique().tolist()
+
+    def time_range(self):
+        """(first, last) fail_time, or None if there is none."""
+        if 'fail_time' not in self.df.columns or self.df['fail_time'].isnull().all():
+            return None
+        return self.df['fail_time'].min(), self.df['fail_time'].max()
+
+    def _matching_rows(self, models, stages, results, start_date, end_date):
+        df = self.df
+        mask = np.ones(len(df), dtype=bool)
+        if models:
+            mask &= value_mask(df['model'], models)
+        if stages:
+            mask &= value_mask(df['stage'], stages)
+        if results:
+            mask &= value_mask(df['result'], results)
+        if start_date and end_date:
+            # Whole days, compared as datetime64 without building per-row date objects
+            times = df['fail_time'].to_numpy()
+            mask &= (times >= np.datetime64(start_date, 'ns')) & (times < np.datetime64(end_date, 'ns') + np.timedelta64(1, 'D'))
+        return np.flatnonzero(mask)
+
+    def aggregate(self, models, stages, results, start_date, end_date):
+        """Ticket count and the chart data (None where the column is missing) for a selection."""
+        rows = self._rows(models, stages, results, start_date, end_date)
+        filtered = self.df.iloc[rows]
+
+        view = {'count': len(rows), 'top_errors': None, 'errors_over_time': None, 'result_counts': None}
+        if 'Analyzed_Error' in self.df.columns:
+            # Categorical columns also count categories filtered out to zero
+            top_errors = filtered['Analyzed_Error'].value_counts().loc[lambda s: s > 0].head(TOP_ERRORS).reset_index()
+            top_errors.columns = ['Error Message', 'Count']
+            view['top_errors'] = top_errors
+        if start_date and end_date:
+            # Group by day, through the precomputed date_str ("" without fail_time)
+            days = filtered['date_str'].value_counts(sort=False).loc[lambda s: s > 0].drop("", errors='ignore')
+            view['errors_over_time'] = _daily(days)
+        if 'result' in self.df.columns:
+            result_counts = filtered['result'].value_counts().loc[lambda s: s > 0].reset_index()
+            result_counts.columns = ['Result', 'Count']
+            view['result_counts'] = result_counts
+        return view
+
+    def _ordered_rows(self, selection, search, columns, sort_by, ascending):
+        rows = self._rows(*selection)
+        if search and columns:
+            part = self.df.iloc[rows]
+            found = np.zeros(len(rows), dtype=bool)
+            for column in columns:
+                found |= search_mask(part[column], search)
+            rows = rows[found]
+        if sort_by:
+            values = self.df[sort_by].iloc[rows].reset_index(drop=True)
+            rows = rows[values.sort_values(ascending=ascending, kind='stable', na_position='last').index.to_numpy()]
+        return rows
+
+    def raw_page(self, selection, search, columns, sort_by, ascending, offset, limit):
+        """(matching rows, DataFrame of ``columns`` for rows offset..offset+limit).
+
+        Rows of the selection containing ``search`` in one of ``columns``,
+        sorted by ``sort_by`` (else in file order).
+        """
+        rows = self._ordered(selection, search, columns, sort_by, ascending)
+        return len(rows), self.df.iloc[rows[offset:offset + limit]][list(columns)]
+
+
+def _ident(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _literal(text):
+    return "'" + text.replace("'", "''") + "'"
+
+
+class DuckDBQueries:
+    """The same queries, run as SQL by DuckDB over the Parquet files of a TicketStore.
+
+    Filtering, grouping, sorting and paging all happen inside DuckDB, which
+    reads only the columns a query needs; just the results come back as
+    DataFrames. Superseded versions of a ticket are joined away through the
+    store's index, which is copied into DuckDB along with the list of part
+    files while the store is locked: the queries see the store as it was at
+    ``last_seq``, however it is ingested into afterwards. A newer snapshot is
+    only taken if a compact() elsewhere removed files of this one. Needs the
+    duckdb package.
+    """
+
+    def __init__(self, store_dir):
+        try:
+            import duckdb
+        except ImportError:
+            raise ImportError("the duckdb query engine requires the duckdb package") from None
+
+        self._duckdb = duckdb
+        self._store_dir = store_dir
+        self._con = duckdb.connect()
+        self._load()
+
+    def _load(self):
+        store = TicketStore(self._store_dir)
+        try:
+            self.last_seq = store.last_seq
+            # Listed rather than globbed, to leave out parts an interrupted compact() left
+            parts = [p for directory in sorted(glob.glob(os.path.join(self._store_dir, "date=*")))
+                     for p in live_parts(directory)]
+            index = store.index[["key", "seq"]]
+            self.empty = not parts or index.empty
+            if not self.empty:
+                self._con.register("store_index", index)
+                self._con.execute("CREATE OR REPLACE TABLE ticket_index AS SELECT key, seq FROM store_index")
+                self._con.unregister("store_index")
+        finally:
+            store.close()
+        self.columns = []
+        if self.empty:
+            return
+        files = "[" + ", ".join(_literal(p) for p in parts) + "]"
+        self._con.execute(f"""
+            CREATE OR REPLACE VIEW tickets AS
+            SELECT t.*
+            FROM read_parquet({files}, union_by_name = true, hive_partitioning = false) t
+            JOIN ticket_index i ON t._key = i.key AND t._seq = i.seq
+        """)
+        self.columns = [row[0] for row in self._con.execute("DESCRIBE tickets").fetchall()
+                        if row[0] not in ("_key", "_seq")]
+
+    def _query(self, sql, params=()):
+        # One cursor per query, so Streamlit sessions can query from their own threads
+        try:
+            return self._con.cursor().execute(sql, list(params))
+        except self._duckdb.IOException:
+            # Parts of the snapshot were compacted away since
+            self._load()
+            return self._con.cursor().execute(sql, list(params))
+
+    def values(self, column):
+        """Distinct values of a column, sorted."""
+        return [row[0] for row in self._query(f"SELECT DISTINCT {_ident(column)} FROM tickets ORDER BY 1 NULLS LAST").fetchall()]
+
+    def time_range(self):
+        """(first, last) fail_time, or None if there is none."""
+        if 'fail_time' not in self.columns:
+            return None
+        first, last = self._query("SELECT min(fail_time), max(fail_time) FROM tickets").fetchone()
+        return None if first is None else (first, last)
+
+    def _where(self, models, stages, results, start_date, end_date, extra=()):
+        """WHERE clause and its parameters for a selection plus ``extra`` conditions."""
+        clauses, params = list(extra), []
+        for column, selected in (("model", models), ("stage", stages), ("result", results)):
+            if not selected:
+                continue
+            values = [v for v in selected if not pd.isna(v)]
+            tests = []
+            if values:
+                tests.append(f"{_ident(column)} IN ({', '.join('?' * len(values))})")
+                params += values
+            if len(values) < len(selected):
+                tests.append(f"{_ident(column)} IS NULL")
+            clauses.append("(" + " OR ".join(tests) + ")")
+        if start_date and end_date:
+            clauses.append("fail_time >= ? AND fail_time < ?")
+            params += [start_date, end_date + datetime.timedelta(days=1)]
+        return ("WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def aggregate(self, models, stages, results, start_date, end_date):
+        """Ticket count and the chart data (None where the column is missing) for a selection."""
+        selection = (models, stages, results, start_date, end_date)
+        where, params = self._where(*selection)
+        view = {
+            'count': self._query(f"SELECT count(*) FROM tickets {where}", params).fetchone()[0],
+            'top_errors': None, 'errors_over_time': None, 'result_counts': None,
+        }
+        if 'Analyzed_Error' in self.columns:
+            where, params = self._where(*selection, extra=["Analyzed_Error IS NOT NULL"])
+            view['top_errors'] = self._query(
+                f'SELECT Analyzed_Error AS "Error Message", count(*) AS "Count" FROM tickets {where}'
+                f' GROUP BY 1 ORDER BY 2 DESC, 1 LIMIT {TOP_ERRORS}', params).df()
+        if start_date and end_date:
+            where, params = self._where(*selection, extra=["date_str <> ''"])
+            days = self._query(f"SELECT date_str, count(*) FROM tickets {where} GROUP BY 1", params).fetchall()
+            view['errors_over_time'] = _daily(pd.Series(dict(days), dtype="int64"))
+        if 'result' in self.columns:
+            where, params = self._where(*selection, extra=["result IS NOT NULL"])
+            view['result_counts'] = self._query(
+                f'SELECT result AS "Result", count(*) AS "Count" FROM tickets {where}'
+                f' GROUP BY 1 ORDER BY 2 DESC, 1', params).df()
+        return view
+
+    def raw_page(self, selection, search, columns, sort_by, ascending, offset, limit):
+        """(matching rows, DataFrame of ``columns`` for rows offset..offset+limit).
+
+        Rows of the selection containing ``search`` in one of ``columns``,
+        sorted by ``sort_by`` (else in ingest order).
+        """
+        extra, search_params = [], []
+        if search and columns:
+            extra.append("(" + " OR ".join(
+                f"contains(lower(CAST({_ident(c)} AS VARCHAR)), ?)" for c in columns) + ")")
+            search_params = [search.lower()] * len(columns)
+        where, params = self._where(*selection, extra=extra)
+        params = search_params + params
+        total = self._query(f"SELECT count(*) FROM tickets {where}", params).fetchone()[0]
+        if not columns:
+            return total, pd.DataFrame(index=range(min(limit, max(total - offset, 0))))
+        order = f"{_ident(sort_by)} {'ASC' if ascending else 'DESC'} NULLS LAST, " if sort_by else ""
+        page = self._query(
+            f"SELECT {', '.join(_ident(c) for c in columns)} FROM tickets {where}"
+            f" ORDER BY {order}_seq, _key LIMIT ? OFFSET ?", params + [limit, offset]).df()
+        return total, page
@@ -0,0 +1,450 @@
+import glob
+import json
+import os
+import re
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from ingestion import append_categorized, iter_ticket_chunks, prepare_tickets
+from normalization import NormalizationCache
+
+# Tickets are identified by fail_id (falling back to id, then to their content)
+KEY_COLUMN = "fail_id"
+
+# After an ingest, compact() rewrites the partitions whose superseded ticket
+# versions have grown past this fraction of their current tickets
+COMPACT_THRESHOLD = 0.5
+
+# Exports are named after the time of their snapshot: tickets_20260108_221513.csv
+_SNAPSHOT_RE = re.compile(r"(\d{8}_\d{6})")
+
+
+def export_snapshot(path):
+    """Snapshot timestamp in the name of an export ("20260108_221513"), or None."""
+    found = _SNAPSHOT_RE.findall(os.path.basename(path))
+    return found[-1] if found else None
+
+
+def ticket_keys(df, fingerprints):
+    """Key of every row: fail_id, else id, else a hash of the row itself."""
+    key = df[KEY_COLUMN] if KEY_COLUMN in df.columns else pd.Series(np.nan, index=df.index, dtype=object)
+    if "id" in df.columns:
+        key = key.fillna(df["id"])
+    return key.where(key.notna(), "_" + fingerprints.astype(str)).astype(str)
+
+
+def _pairs(keys, seqs):
+    return pd.MultiIndex.from_arrays([np.asarray(keys), np.asarray(seqs)])
+
+
+def _part_seq(path):
+    # part-000012.parquet / part-000012-compacted.parquet -> 12
+    return int(os.path.basename(path)[len("part-"):].split(".")[0].split("-")[0])
+
+
+class _FileLock:
+    """Exclusive lock on a file, between processes and between handles of one process."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def acquire(self):
+        f = open(self.path, "a+b")
+        try:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        # LK_LOCK gives up after 10 attempts, a second apart
+                        pass
+        except BaseException:
+            f.close()
+            raise
+        self._file = f
+
+    def release(self):
+        f, self._file = self._file, None
+        if f is None:
+            return
+        if fcntl is None:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        f.close()
+
+
+def _superseded(parts):
+    """Parts already held by a newer compacted file of their partition.
+
+    compact() publishes its file before removing the parts it replaces; these
+    are what an interrupted run leaves behind.
+    """
+    compacted = [p for p in parts if p.endswith("-compacted.parquet")]
+    if not compacted:
+        return []
+    newest = max(compacted, key=_part_seq)
+    return [p for p in parts if p != newest and _part_seq(p) <= _part_seq(newest)]
+
+
+def store_seq(root):
+    """TicketStore.last_seq of the store at ``root``, from its file names alone.
+
+    Cheap enough to poll, and does not wait for the store's lock: it goes up
+    as soon as an ingest has written its parts.
+    """
+    return max((_part_seq(p) for p in glob.glob(os.path.join(root, "date=*", "part-*.parquet"))), default=0)
+
+
+def live_parts(directory):
+    """Part files of a partition directory, oldest first, less the _superseded() ones."""
+    parts = sorted(glob.glob(os.path.join(directory, "part-*.parquet")), key=_part_seq)
+    stale = set(_superseded(parts))
+    return [p for p in parts if p not in stale]
+
+
+class TicketStore:
+    """Append-only local store of prepared tickets, in Parquet partitioned by fail date.
+
+    Layout under ``root``::
+
+        date=2026-01-09/part-000001.parquet   prepared rows written by ingest #1
+        date=2026-01-09/part-000002.parquet   rows that were new or changed in #2
+        date=2026-01-08/part-000003-compacted.parquet
+                                              current rows of the older parts,
+                                              rewritten by compact() as #3
+        _index.parquet                        key, fingerprint, seq, date and
+                                              snapshot of the current version
+                                              of each ticket
+
+    ingest() hashes the raw rows, compares them with the index and only
+    prepares (parses, normalizes) and appends the new or changed ones. A
+    changed ticket, e.g. a new status or result, is written again as a newer
+    version; readers keep only the version the index points to. compact()
+    drops superseded versions.
+
+    Each ticket remembers the snapshot (export_snapshot()) it was last seen
+    in, so an older export ingested again, e.g. copied back into the drop
+    directory, does not roll newer tickets back.
+
+    Use as a context manager; the index is saved on a clean exit. An open
+    store is locked (LOCK_FILE) until then, so other handles, in this process
+    or another one such as the app and generate_dashboard.py, wait for it
+    before they read the index and pick their sequence numbers.
+    """
+
+    INDEX_FILE = "_index.parquet"
+    LOCK_FILE = "_lock"
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._index_path = os.path.join(root, self.INDEX_FILE)
+        self._lock = _FileLock(os.path.join(root, self.LOCK_FILE))
+        self._lock.acquire()
+        try:
+            if os.path.exists(self._index_path):
+                self.index = pd.read_parquet(self._index_path)
+            else:
+                self.index = pd.DataFrame({
+                    "key": pd.Series(dtype=object),
+                    "fingerprint": pd.Series(dtype="uint64"),
+                    "seq": pd.Series(dtype="int64"),
+                    "date": pd.Series(dtype=object),
+                    "snapshot": pd.Series(dtype=object),
+                })
+        except BaseException:
+            self._lock.release()
+            raise
+        if "snapshot" not in self.index.columns:
+            # Stores written before snapshots were kept: any snapshot is newer
+            self.index["snapshot"] = ""
+        self._next_seq = int(self.index["seq"].max()) + 1 if len(self.index) else 1
+        # Parts of an ingest whose index was never saved still reserve their seq
+        self._next_seq = max(self._next_seq, store_seq(root) + 1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.save()
+        finally:
+            self.close()
+
+    def close(self):
+        """Release the lock without saving the index."""
+        self._lock.release()
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def last_seq(self):
+        """Sequence number of the newest ingest or compact() (0 before the first one)."""
+        return self._next_seq - 1
+
+    def save(self):
+        tmp = self._index_path + ".tmp"
+        self.index.to_parquet(tmp, index=False)
+        os.replace(tmp, self._index_path)
+
+    def _partition_dir(self, date):
+        return os.path.join(self.root, f"date={date or 'unknown'}")
+
+    def ingest(self, df, cache=None, pool=None, snapshot=None):
+        """Append the new or changed tickets of a raw export chunk.
+
+        ``snapshot`` is the export_snapshot() of the chunk's export: tickets
+        last seen in a newer snapshot are left as they are. Without one the
+        chunk is taken as the newest. ``pool`` is passed on to
+        prepare_tickets. Returns (new, changed) ticket counts.
+        """
+        fingerprints = pd.util.hash_pandas_object(df, index=False)
+        batch = pd.DataFrame({
+            "key": ticket_keys(df, fingerprints).to_numpy(),
+            "fingerprint": fingerprints.to_numpy(),
+            "pos": np.arange(len(df)),
+        }).drop_duplicates("key", keep="last")
+
+        unchanged = _pairs(batch["key"], batch["fingerprint"]).isin(
+            _pairs(self.index["key"], self.index["fingerprint"]))
+        if snapshot is not None:
+            # Snapshot each ticket was last seen in ("" for new tickets)
+            seen = batch["key"].map(pd.Series(self.index["snapshot"].to_numpy(), index=self.index["key"])).fillna("")
+            # Unchanged tickets are now known to hold as of this snapshot too
+            seen_again = batch["key"][unchanged & (seen < snapshot).to_numpy()]
+            self.index.loc[self.index["key"].isin(seen_again), "snapshot"] = snapshot
+            # and changed ones of a newer snapshot stay as they are
+            unchanged |= (seen > snapshot).to_numpy()
+        batch = batch[~unchanged]
+        if batch.empty:
+            return 0, 0
+        new = int((~batch["key"].isin(self.index["key"])).sum())
+
+        seq = self._next_seq
+        self._next_seq += 1
+        delta = prepare_tickets(df.iloc[batch["pos"].to_numpy()].copy(), cache, pool)
+        delta["_key"] = batch["key"].to_numpy()
+        delta["_seq"] = seq
+        for date, part in delta.groupby("date_str", sort=False):
+            directory = self._partition_dir(date)
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"part-{seq:06d}.parquet")
+            part.to_parquet(path + ".tmp", index=False)
+            os.replace(path + ".tmp", path)
+
+        self.index = pd.concat([
+            self.index[~self.index["key"].isin(batch["key"])],
+            pd.DataFrame({
+                "key": batch["key"].to_numpy(),
+                "fingerprint": batch["fingerprint"].to_numpy(),
+                "seq": np.int64(seq),
+                "date": delta["date_str"].to_numpy(),
+                "snapshot": snapshot or "",
+            }),
+        ], ignore_index=True)
+        return new, len(batch) - new
+
+    def _partitions(self):
+        """Yield (directory, part files, current (key, seq) pairs) per partition."""
+        current = {
+            self._partition_dir(date): _pairs(group["key"], group["seq"])
+            for date, group in self.index.groupby("date", sort=False)
+        }
+        empty = _pairs([], [])
+        for directory in sorted(glob.glob(os.path.join(self.root, "date=*"))):
+            yield directory, live_parts(directory), current.get(directory, empty)
+
+    @staticmethod
+    def _current_rows(parts, current):
+        df = pd.concat([pd.read_parquet(p) for p in parts], ignore_index=True)
+        return df[_pairs(df["_key"], df["_seq"]).isin(current)]
+
+    def iter_current(self):
+        """Yield the current version of every ticket, one partition at a time."""
+        for _, parts, current in self._partitions():
+            if not parts or current.empty:
+                continue
+            df = self._current_rows(parts, current)
+            if not df.empty:
+                yield df.drop(columns=["_key", "_seq"]).reset_index(drop=True)
+
+    def changes_since(self, seq):
+        """Current version of the tickets written after ingest ``seq``, keys in ``_key``.
+
+        Lets a reader that holds the tickets as of ``seq`` catch up: replace
+        its rows with these keys by these rows.
+        """
+        frames = []
+        for _, parts, current in self._partitions():
+            parts = [p for p in parts if _part_seq(p) > seq]
+            if not parts or current.empty:
+                continue
+            df = self._current_rows(parts, current)
+            # Compacted files also hold the older rows they were rewritten from
+            df = df[df["_seq"] > seq]
+            if not df.empty:
+                frames.append(df.drop(columns=["_seq"]))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def load(self):
+        """All current tickets as one DataFrame."""
+        frames = list(self.iter_current())
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def compact(self, threshold=None):
+        """Rewrite partitions as a single file without superseded versions.
+
+        Every partition of more than one part is rewritten, or with a
+        ``threshold`` (see COMPACT_THRESHOLD) only those where the superseded
+        versions outnumber ``threshold`` times the current tickets. The files
+        take a new sequence number, so readers polling store_seq() notice.
+        Returns the number of partitions rewritten.
+
+        The new file is in place before the old parts are removed, so a crash
+        in between loses nothing; the parts it left are skipped by readers
+        and removed by the next compact().
+        """
+        seq = None
+        rewritten = 0
+        for directory, parts, current in self._partitions():
+            for p in _superseded(glob.glob(os.path.join(directory, "part-*.parquet"))):
+                os.remove(p)
+            if not parts or (len(parts) == 1 and not current.empty):
+                continue
+            if threshold is not None:
+                rows = sum(len(pd.read_parquet(p, columns=["_seq"])) for p in parts)
+                if rows - len(current) <= threshold * len(current):
+                    continue
+            df = self._current_rows(parts, current)
+            if not df.empty:
+                if seq is None:
+                    seq = self._next_seq
+                    self._next_seq += 1
+                path = os.path.join(directory, f"part-{seq:06d}-compacted.parquet")
+                df.to_parquet(path + ".tmp", index=False)
+                os.replace(path + ".tmp", path)
+            for p in parts:
+                os.remove(p)
+            rewritten += 1
+        return rewritten
+
+
+class LiveTickets:
+    """Prepared tickets of the exports dropped into a directory, kept current in memory.
+
+    refresh() ingests the exports matching ``pattern`` in ``drop_dir`` that
+    are new or were rewritten (by size + mtime) into the TicketStore at
+    ``store_dir``, in file name order, and then replaces or appends only the
+    tickets that came out new or changed. An older export that is touched
+    again only adds the tickets no newer export has. The exports already ingested are
+    remembered in the store, so a restart does not ingest them again.
+
+    ``current`` is a (version, frame) pair, replaced as a whole; the version
+    goes up whenever the frame changes. With ``materialize=False`` the
+    tickets only go into the store (for readers that query it directly):
+    the frame stays None and the version goes up whenever the store changes.
+    Tickets another process (generate_dashboard.py) ingests into the store
+    are picked up as well, by its store_seq(). One instance can be shared
+    between threads.
+    """
+
+    SOURCES_FILE = "_sources.json"
+
+    def __init__(self, drop_dir, store_dir, pattern="tickets_*.csv", cache_path=None, materialize=True):
+        self.drop_dir = drop_dir
+        self.store_dir = store_dir
+        self.pattern = pattern
+        self.cache_path = cache_path
+        self.materialize = materialize
+        self.current = (0, pd.DataFrame() if materialize else None)
+        self._keys = np.array([], dtype=object)
+        self._seq = 0
+        self._checked = None
+        self._lock = threading.Lock()
+        self._sources_path = os.path.join(store_dir, self.SOURCES_FILE)
+        self._sources = {}
+        if os.path.exists(self._sources_path):
+            with open(self._sources_path, encoding="utf-8") as f:
+                self._sources = {path: tuple(stamp) for path, stamp in json.load(f).items()}
+
+    def _pending(self):
+        pending = []
+        for path in sorted(glob.glob(os.path.join(self.drop_dir, self.pattern))):
+            st = os.stat(path)
+            stamp = (st.st_size, st.st_mtime_ns)
+            if self._sources.get(path) != stamp:
+                pending.append((path, stamp))
+        return pending
+
+    def _ingest(self, pending):
+        """Ingest ``pending`` exports; returns what changed since the last refresh.
+
+        Without ``materialize`` that is just whether the store has anything new.
+        """
+        # SQLite connections stay on the thread that opened them
+        cache = NormalizationCache(self.cache_path) if self.cache_path else None
+        try:
+            with TicketStore(self.store_dir) as store:
+                for path, stamp in pending:
+                    for chunk in iter_ticket_chunks(path):
+                        store.ingest(chunk, cache, snapshot=export_snapshot(path))
+                    self._sources[path] = stamp
+                if pending:
+                    store.compact(COMPACT_THRESHOLD)
+                if self.materialize:
+                    delta = store.changes_since(self._seq)
+                else:
+                    delta = store.last_seq > self._seq
+                self._seq = store.last_seq
+        finally:
+            if cache is not None:
+                cache.close()
+        with open(self._sources_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self._sources, f)
+        os.replace(self._sources_path + ".tmp", self._sources_path)
+        return delta
+
+    def refresh(self, max_age=0):
+        """Pick up new or rewritten exports; returns ``current``.
+
+        The drop directory is not looked at again within ``max_age`` seconds
+        of the last time.
+        """
+        with self._lock:
+            version, frame = self.current
+            now = time.monotonic()
+            if self._checked is not None and now - self._checked < max_age:
+                return self.current
+            self._checked = now
+            pending = self._pending()
+            if not pending and version and store_seq(self.store_dir) == self._seq:
+                return self.current
+            delta = self._ingest(pending)
+            if not self.materialize:
+                if delta:
+                    self.current = (version + 1, None)
+                return self.current
+            if delta.empty:
+                return self.current
+            keys = delta.pop("_key").to_numpy()
+            keep = ~pd.Series(self._keys).isin(keys).to_numpy()
+            frame = append_categorized(frame[keep].reset_index(drop=True), delta)
+            self._keys = np.concatenate([self._keys[keep], keys])
+            self.current = (version + 1, frame)
+            return self.current